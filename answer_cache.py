@@ -0,0 +1,80 @@
+"""Answer cache shared by all sessions: LRU + TTL in memory, optionally backed by SQLite."""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalise_question(question):
+    """Lowercases and strips punctuation and extra whitespace, so trivially different phrasings share a key."""
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+
+def make_key(question, knowledge_base):
+    """Keys on the normalised question and the knowledge base, so editing the profile invalidates old answers."""
+    kb_hash = hashlib.sha256(knowledge_base.encode()).hexdigest()
+    return hashlib.sha256(f"{kb_hash}\0{normalise_question(question)}".encode()).hexdigest()
+
+
+class AnswerCache:
+    """Thread-safe LRU/TTL cache of answers. With `path`, entries are also stored in SQLite and survive restarts."""
+
+    def __init__(self, max_entries=1024, ttl=24 * 3600, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, answer)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, answer TEXT NOT NULL, stored_at REAL NOT NULL)")
+            self._db.execute("DELETE FROM answers WHERE stored_at < ?", (time.time() - ttl,))
+            self._db.commit()
+
+    def get(self, key):
+        """Returns the cached answer for `key`, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT stored_at, answer FROM answers WHERE key = ?", (key,)).fetchone()
+                if row:
+                    entry = self._remember(key, *row)
+            if entry is None or now - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, answer):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, answer)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO answers (key, answer, stored_at) VALUES (?, ?, ?)", (key, answer, now))
+                self._db.execute("DELETE FROM answers WHERE key NOT IN (SELECT key FROM answers ORDER BY stored_at DESC LIMIT ?)", (self.max_entries,))
+                self._db.commit()
+
+    def _remember(self, key, stored_at, answer):
+        self._entries[key] = (stored_at, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return self._entries[key]
+
+    def size(self):
+        """Approximate bytes of the answers held in memory."""
+        with self._lock:
+            return sum(len(answer) + len(key) for key, (_, answer) in self._entries.items())
+
+    def close(self):
+        """Closes the SQLite connection; the in-memory entries stay usable."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
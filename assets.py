@@ -0,0 +1,162 @@
+"""Asset build stage: pre-transcoded, size-variant copies of the portfolio media.
+
+Run `python assets.py [--static]` at deploy time to warm the cache (and publish it
+to the static folder); main.py also builds any missing variants on first use.
+"""
+import hashlib
+import os
+import shutil
+import sys
+
+MEDIA_DIR = "media"
+ASSET_CACHE_DIR = ".asset_cache"
+# Streamlit serves ./static at app/static/ when server.enableStaticServing is on.
+STATIC_DIR = os.path.join("static", "media")
+STATIC_URL = "app/static/media"
+
+# Sizes the CSS in main.load_css() renders each kind of image at, doubled for high-DPI screens.
+#   profile: .profile-img img is a 200x200 circle (object-fit: cover)
+#   icon:    social icons are <img width="32">
+#   card:    .cert-award-item img is 150px tall (object-fit: contain)
+VARIANTS = {
+    "profile": {"width": 400, "height": 400, "crop": True},
+    "icon": {"width": 64},
+    "card": {"height": 300},
+}
+FORMATS = ("avif", "webp")
+# A data URI can't offer a choice of formats, so inline media is built (and embedded) as WebP only.
+INLINE_FORMATS = ("webp",)
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg"}
+QUALITY = 80
+
+
+def content_hash(path):
+    """Returns a short SHA-256 digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def mime_type(path):
+    """Guesses the image MIME type from a file extension."""
+    return MIME_TYPES.get(os.path.splitext(path)[1].lower().lstrip("."), "application/octet-stream")
+
+
+def _resize(img, spec):
+    """Scales an image down to a variant spec. Never upscales."""
+    from PIL import ImageOps
+
+    width, height = spec.get("width"), spec.get("height")
+    if spec.get("crop"):
+        side = min(width, img.width, img.height)
+        return ImageOps.fit(img, (side, side))
+    if width and img.width > width:
+        return img.resize((width, round(img.height * width / img.width)))
+    if height and img.height > height:
+        return img.resize((round(img.width * height / img.height), height))
+    return img
+
+
+def build_variant(path, variant, fmt, cache_dir=ASSET_CACHE_DIR):
+    """Transcodes one image into one variant/format, reusing the cached file if the source is unchanged."""
+    out_path = os.path.join(cache_dir, f"{content_hash(path)}-{variant}.{fmt}")
+    if os.path.exists(out_path):
+        return out_path
+
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = _resize(img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB"), VARIANTS[variant])
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = out_path + ".tmp"
+        img.save(tmp_path, format=fmt.upper(), quality=QUALITY)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def build_assets(entries, cache_dir=ASSET_CACHE_DIR, formats=FORMATS):
+    """Builds every (path, variant) entry in each of `formats` that Pillow supports.
+
+    Returns {(path, variant): {fmt: cached_path}}. Missing sources are skipped, and a
+    format is left out (so callers fall back to the original file) if Pillow can't write it.
+    """
+    try:
+        from PIL import features
+    except ImportError:
+        return {}
+    formats = [fmt for fmt in formats if features.check(fmt)]
+
+    built = {}
+    for path, variant in entries:
+        if not os.path.exists(path):
+            continue
+        outputs = {}
+        for fmt in formats:
+            try:
+                outputs[fmt] = build_variant(path, variant, fmt, cache_dir)
+            except Exception as e:
+                print(f"Could not build {fmt} {variant} variant of {path}: {e}", file=sys.stderr)
+        built[(path, variant)] = outputs
+    return built
+
+
+def publish_static(built, static_dir=STATIC_DIR, base_url=STATIC_URL):
+    """Copies built variants into the static folder under content-hashed (fingerprinted) names.
+
+    Entries with no variants publish the original file instead. Returns
+    {(path, variant): {fmt: url}}; a fingerprinted URL never changes content, so it
+    can be served with `Cache-Control: immutable`.
+    """
+    os.makedirs(static_dir, exist_ok=True)
+    urls = {}
+    for (path, variant), outputs in built.items():
+        files = outputs or {os.path.splitext(path)[1].lower().lstrip("."): path}
+        urls[(path, variant)] = {}
+        for fmt, src in files.items():
+            name = os.path.basename(src) if outputs else f"{content_hash(path)}.{fmt}"
+            dest = os.path.join(static_dir, name)
+            if not os.path.exists(dest):
+                shutil.copyfile(src, dest + ".tmp")
+                os.replace(dest + ".tmp", dest)
+            urls[(path, variant)][fmt] = f"{base_url.rstrip('/')}/{name}"
+    return urls
+
+
+def picture_tag(urls, attrs=""):
+    """Renders {fmt: url} as a <picture> that prefers AVIF and falls back to WebP (or the original)."""
+    fallback = urls.get("webp") or list(urls.values())[-1]
+    sources = "".join(f'<source srcset="{url}" type="{MIME_TYPES[fmt]}">' for fmt, url in urls.items() if url != fallback)
+    return f'<picture>{sources}<img src="{fallback}"{attrs}></picture>'
+
+
+def default_variant(path):
+    """Picks a variant from the media directory layout described in the README."""
+    parent = os.path.basename(os.path.dirname(path))
+    if parent in ("certifications", "awards", "badges"):
+        return "card"
+    if os.path.basename(path).startswith("profile-photo"):
+        return "profile"
+    return "icon"
+
+
+def discover_media(media_dir=MEDIA_DIR):
+    """Lists (path, variant) entries for every image under the media directory."""
+    entries = []
+    for root, _, files in os.walk(media_dir):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower().lstrip(".") in MIME_TYPES:
+                path = os.path.join(root, name)
+                entries.append((path, default_variant(path)))
+    return entries
+
+
+if __name__ == "__main__":
+    built = build_assets(discover_media())
+    if "--static" in sys.argv:
+        publish_static(built)
+    for (path, variant), outputs in built.items():
+        original = os.path.getsize(path)
+        sizes = ", ".join(f"{fmt} {os.path.getsize(p) / 1024:.0f} KB" for fmt, p in outputs.items())
+        print(f"{path} ({variant}, {original / 1024:.0f} KB) -> {sizes or 'no variants'}")
@@ -0,0 +1,145 @@
+"""Render benchmark for the portfolio pages, checked against stored budgets.
+
+Runs main.py and test_mode.py headlessly through Streamlit's AppTest harness and
+measures, per page:
+
+    cold_ms        first script run in a fresh process (imports, st.cache_* builds)
+    warm_ms        median of the following reruns
+    elements       elements and blocks in the rendered tree
+    payload_bytes  markdown/HTML text the page emits
+    peak_kb        peak Python memory during one warm rerun (tracemalloc)
+
+Each page runs in its own subprocess so cold starts really are cold. Results are
+compared with bench_budgets.json and the script exits non-zero when any budget is
+exceeded. Time budgets depend on the machine; --update tightens them to this run
+(plus headroom) but never raises one: a slower page needs a deliberate edit.
+
+    python bench_render.py [--reruns 10] [--update] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+PAGES = ("main.py", "test_mode.py")
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_budgets.json")
+# Headroom applied by --update: run times are noisy, sizes shouldn't drift without a reason.
+HEADROOM = {"cold_ms": 2.0, "warm_ms": 2.0, "elements": 1.2, "payload_bytes": 1.2, "peak_kb": 1.5}
+# Added on top, so a page that renders in a few milliseconds doesn't fail on scheduler jitter.
+SLACK = {"cold_ms": 100, "warm_ms": 20}
+# The chat never reaches the network during a benchmark run.
+BENCH_ENV = {"PORTFOLIO_CHAT_BACKEND": "fake", "PORTFOLIO_METRICS_LOG": "", "PORTFOLIO_METRICS_FILE": ""}
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+def page_stats(app):
+    """Counts the rendered elements and the markdown/HTML bytes they carry."""
+    nodes = [node for node in walk(app._tree) if getattr(node, "proto", None) is not None]
+    payload = sum(len(node.proto.body.encode()) for node in nodes if hasattr(node.proto, "body"))
+    return len(nodes), payload
+
+
+def bench_page(page, reruns):
+    """Benchmarks one page in this process; meant to run in a fresh subprocess."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.abspath(page), default_timeout=120)
+    started = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(f"{page} raised: {app.exception[0].message}")
+
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        warm.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    app.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elements, payload = page_stats(app)
+    return {
+        "cold_ms": round(cold * 1000, 1),
+        "warm_ms": round(statistics.median(warm) * 1000, 1),
+        "elements": elements,
+        "payload_bytes": payload,
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def run_isolated(page, reruns):
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", page, "--reruns", str(reruns)],
+        env=dict(os.environ, **BENCH_ENV), capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check(results, budgets):
+    """Returns one message per metric that is over its budget."""
+    failures = []
+    for page, measured in results.items():
+        for metric, value in measured.items():
+            limit = budgets.get(page, {}).get(metric)
+            if limit is not None and value > limit:
+                failures.append(f"{page}: {metric} {value} exceeds budget {limit}")
+    return failures
+
+
+def load_budgets():
+    if not os.path.exists(BUDGETS_FILE):
+        return {}
+    with open(BUDGETS_FILE) as f:
+        return json.load(f)
+
+
+def save_budgets(results):
+    """Budgets from this run plus headroom; an existing budget is only ever tightened, never raised."""
+    current = load_budgets()
+    budgets = {page: {metric: min(round(value * HEADROOM[metric] + SLACK.get(metric, 0)), current.get(page, {}).get(metric, float("inf")))
+                      for metric, value in measured.items()}
+               for page, measured in results.items()}
+    with open(BUDGETS_FILE, "w") as f:
+        json.dump(budgets, f, indent=2)
+        f.write("\n")
+    return budgets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10, help="warm reruns per page")
+    parser.add_argument("--update", action="store_true", help="rewrite bench_budgets.json from this run")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(bench_page(args.worker, args.reruns)))
+        sys.exit(0)
+
+    results = {page: run_isolated(page, args.reruns) for page in PAGES}
+    budgets = save_budgets(results) if args.update else load_budgets()
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for page, measured in results.items():
+            print(f"{page:14} " + "  ".join(
+                f"{metric}={value} (<= {budgets.get(page, {}).get(metric, '-')})" for metric, value in measured.items()))
+
+    failures = check(results, budgets)
+    for failure in failures:
+        print("OVER BUDGET  " + failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
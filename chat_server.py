@@ -0,0 +1,150 @@
+"""Standalone chat endpoint for the static export: the only part of the site that runs Python.
+
+    POST /api/chat   {"session": "<id>", "message": "<question>", "profile": "<tenant>"}  ->  the reply, streamed as text/plain
+    GET  /healthz    200 "ok", or "degraded" while the model's health probe is failing
+
+Replies come from chatbot.stream_chatbot_response, so the router, answer cache,
+scheduler and metrics behave exactly as in the Streamlit app. Conversations live in
+the same bounded store (chatbot.get_conversation_store) as the app's, one per session
+and profile. "profile" is optional and selects a tenant (see tenants.py); without it
+the default profile answers.
+
+    python chat_server.py [--port 8000] [--static site] [--allow-origin https://portfolio.example.com]
+"""
+import argparse
+import hashlib
+import json
+import logging
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import chatbot
+import metrics
+from conversation_store import SAFE_ID
+
+MAX_MESSAGE_CHARS = 2000
+# A request body is read only if its Content-Length is within this; room for a full message in UTF-8.
+MAX_BODY_BYTES = 8 * 1024
+
+logger = logging.getLogger("portfolio")
+
+
+def conversation_key(tenant_name, session):
+    """The store id of a session's conversation with one profile (a fixed-length digest, since both parts may contain '-')."""
+    return hashlib.sha256(f"{tenant_name}\0{session}".encode()).hexdigest()[:32]
+
+
+class ChatHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    allow_origin = None
+    static_dir = None  # SimpleHTTPRequestHandler would otherwise serve the working directory
+
+    def end_headers(self):
+        if self.allow_origin:
+            self.send_header("Access-Control-Allow-Origin", self.allow_origin)
+            self.send_header("Vary", "Origin")
+        super().end_headers()
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.static_dir:
+            super().do_HEAD()
+        else:
+            self.send_text(404, "not found")
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self.send_text(200, "degraded" if chatbot.chat_degraded() else "ok")
+        elif self.static_dir:
+            super().do_GET()
+        else:
+            self.send_text(404, "not found")
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self.send_text(404, "not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            self.close_connection = True  # the body is left unread, so the connection can't be reused
+            if length > MAX_BODY_BYTES:
+                self.send_text(413, f"request body over {MAX_BODY_BYTES} bytes")
+            else:
+                self.send_text(400, "expected a Content-Length")
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            session, message = str(request["session"]), str(request["message"]).strip()
+            profile = request.get("profile")
+        except (ValueError, KeyError, TypeError):
+            self.send_text(400, "expected JSON with 'session' and 'message'")
+            return
+        if not message or len(message) > MAX_MESSAGE_CHARS:
+            self.send_text(400, f"message must be 1-{MAX_MESSAGE_CHARS} characters")
+            return
+        if profile is not None and not isinstance(profile, str):
+            self.send_text(400, "'profile' must be a string")
+            return
+        if (tenant := chatbot.get_tenant(profile)) is None:
+            self.send_text(404, f"no profile called {profile!r}")
+            return
+
+        if not SAFE_ID.match(session):
+            self.send_text(400, "'session' must be 1-64 letters, digits, '-' or '_'")
+            return
+        # One conversation per session and profile, as in the app.
+        conversation_id = conversation_key(tenant.name, session)
+        store = chatbot.get_conversation_store()
+        memory = store.get(conversation_id)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = []
+        with metrics.run("chat_api"):
+            for text in chatbot.stream_chatbot_response(message, memory, tenant=tenant, conversation_id=conversation_id):
+                chunks.append(text)
+                data = text.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        if chunks:  # nothing if a newer message for the session cancelled this one
+            store.add_turn(conversation_id, message, "".join(chunks))
+        chatbot.record_cache_stats()
+
+    def send_text(self, status, text):
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--static", metavar="DIR", help="also serve an exported site from DIR (for local testing)")
+    parser.add_argument("--allow-origin", help="CORS origin allowed to call the endpoint, when the site is on another host")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ChatHandler.allow_origin, ChatHandler.static_dir = args.allow_origin, args.static
+    server = ThreadingHTTPServer((args.host, args.port), partial(ChatHandler, directory=args.static))
+    logger.info("chat endpoint on http://%s:%d/api/chat", args.host, args.port)
+    server.serve_forever()
@@ -0,0 +1,371 @@
+"""The portfolio chatbot: knowledge-base retrieval, answer cache, scheduling and the streamed reply.
+
+Shared by the Streamlit page (main.py) and the standalone chat endpoint
+(chat_server.py). The st.cache_* resources here work outside a Streamlit
+server too, so both get one model, cache and scheduler per process. Nothing
+heavy is imported until the first chat message needs the model.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from functools import partial
+
+import streamlit as st
+
+import answer_cache
+import fragments
+import intent_router
+import metrics
+import model_backends
+import tenants
+from conversation_store import ConversationStore
+from memory import ConversationMemory
+from profile_data import DEFAULT_PROFILE
+from scheduler import Abort, RequestScheduler
+
+# Answers to questions asked with no prior conversation are shared across sessions.
+# PORTFOLIO_ANSWER_CACHE names a SQLite file that keeps them across restarts.
+ANSWER_CACHE_PATH = os.environ.get("PORTFOLIO_ANSWER_CACHE")
+ANSWER_CACHE_TTL = int(os.environ.get("PORTFOLIO_ANSWER_CACHE_TTL", 24 * 3600))
+
+# Limits on calls to Gemini across all sessions (gemini-1.5-flash's free tier allows 15 per minute).
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("PORTFOLIO_GEMINI_CONCURRENCY", 4))
+GEMINI_RPM = int(os.environ.get("PORTFOLIO_GEMINI_RPM", 15))
+
+# Tenants (other people's profiles, see tenants.py) resident at once, and their estimated memory budget.
+MAX_TENANTS = int(os.environ.get("PORTFOLIO_MAX_TENANTS", 200))
+TENANT_MEMORY_MB = float(os.environ.get("PORTFOLIO_TENANT_MEMORY_MB", 128))
+
+# Every session's conversation lives in one store with a shared memory budget. Conversations
+# idle for PORTFOLIO_CHAT_IDLE_MINUTES are spilled to PORTFOLIO_CHAT_SPILL_DIR if set, else dropped.
+CHAT_MEMORY_MB = float(os.environ.get("PORTFOLIO_CHAT_MEMORY_MB", 64))
+CHAT_IDLE_MINUTES = float(os.environ.get("PORTFOLIO_CHAT_IDLE_MINUTES", 30))
+CHAT_SPILL_DIR = os.environ.get("PORTFOLIO_CHAT_SPILL_DIR")
+
+logger = logging.getLogger("portfolio")
+
+# --- GOOGLE AI SETUP ---
+# Sent once per chat as the model's system instruction; each message only carries the question and its context.
+SYSTEM_INSTRUCTION = "You are a friendly AI assistant who will pretend to be the person named at the top of the KNOWLEDGE BASE provided with each question. Answer questions ONLY based on that KNOWLEDGE BASE. Be conversational and present your answers in clear format for the person to quickly understand. If the answer isn't in the knowledge base, say you don't have information on that topic."
+# "gemini" (default, pooled REST client), "gemini-sdk" or "fake[:options]" for offline load tests; see model_backends.py.
+CHAT_BACKEND = os.environ.get("PORTFOLIO_CHAT_BACKEND", "gemini")
+# The backend (and for Gemini, the SDK import) is built on the first chat message, not at
+# startup, and then shared by the whole process. PORTFOLIO_CHAT_PRELOAD=1 builds it in the
+# background right after the first page render instead.
+CHAT_PRELOAD = os.environ.get("PORTFOLIO_CHAT_PRELOAD") == "1"
+CHAT_SETUP_ERROR = None
+_chat_model = None
+_chat_model_lock = threading.Lock()
+_preload_started = False
+
+# Fallback tiers, timed from when the question is asked: a second (hedged) call to the model if
+# the first hasn't started answering after CHAT_HEDGE_AFTER seconds, the smaller fallback model
+# after CHAT_FALLBACK_AFTER, and a canned answer from the knowledge base at CHAT_DEADLINE. A reply
+# that stalls for CHAT_DEADLINE mid-stream is cut short. Tiers only start while the model has room
+# (no call still queued), so an overloaded quota isn't made worse.
+CHAT_HEDGE_AFTER = float(os.environ.get("PORTFOLIO_CHAT_HEDGE_AFTER", 4))
+CHAT_FALLBACK_AFTER = float(os.environ.get("PORTFOLIO_CHAT_FALLBACK_AFTER", 8))
+CHAT_DEADLINE = float(os.environ.get("PORTFOLIO_CHAT_DEADLINE", 15))
+# Backend spec for the fallback tier ("none" disables it); Gemini backends use CHAT_FALLBACK_MODEL.
+CHAT_FALLBACK_BACKEND = os.environ.get("PORTFOLIO_CHAT_FALLBACK_BACKEND", CHAT_BACKEND)
+CHAT_FALLBACK_MODEL = os.environ.get("PORTFOLIO_CHAT_FALLBACK_MODEL", "gemini-1.5-flash-8b")
+_fallback_model = None
+_fallback_failed = False
+# Cancel events of the requests still running, by conversation; a new message cancels the previous one.
+_requests = {}
+_requests_lock = threading.Lock()
+
+def get_api_key():
+    if key := os.environ.get("GOOGLE_API_KEY"):
+        return key
+    try:
+        return st.secrets["GOOGLE_API_KEY"]
+    except Exception:
+        return None
+
+def backend_configured(spec):
+    """Whether a backend spec has what it needs to start (Gemini needs an API key), checked without importing the SDK."""
+    return not model_backends.parse_spec(spec)[0].startswith("gemini") or bool(get_api_key())
+
+def chat_configured():
+    """Whether the main chat backend is configured; without it only the fallback tier (if any) and the router answer."""
+    return backend_configured(CHAT_BACKEND)
+
+def get_chat_model():
+    """The process-wide chat backend, built on first use; None if it isn't configured or setting it up failed."""
+    global _chat_model, CHAT_SETUP_ERROR
+    if not chat_configured():
+        return None
+    with _chat_model_lock:
+        if _chat_model is None and CHAT_SETUP_ERROR is None:
+            with metrics.span("chat_model_init"):
+                try:
+                    if model_backends.parse_spec(CHAT_BACKEND)[0].startswith("gemini"):
+                        _chat_model = model_backends.create_backend(CHAT_BACKEND, api_key=get_api_key(), system_instruction=SYSTEM_INSTRUCTION)
+                    else:
+                        _chat_model = model_backends.create_backend(CHAT_BACKEND)
+                except Exception as e:
+                    logger.warning("Chat model setup failed: %s", e)
+                    CHAT_SETUP_ERROR = e
+        return _chat_model
+
+def get_fallback_model():
+    """The fallback tier's backend, built on first use; None if disabled, not configured or setting it up failed."""
+    global _fallback_model, _fallback_failed
+    if CHAT_FALLBACK_BACKEND == "none" or not backend_configured(CHAT_FALLBACK_BACKEND):
+        return None
+    with _chat_model_lock:
+        if _fallback_model is None and not _fallback_failed:
+            name = model_backends.parse_spec(CHAT_FALLBACK_BACKEND)[0]
+            try:
+                if name == "gemini":
+                    # Its own health probe would only duplicate the primary model's.
+                    _fallback_model = model_backends.create_backend(CHAT_FALLBACK_BACKEND, api_key=get_api_key(), system_instruction=SYSTEM_INSTRUCTION,
+                                                                    model_name=CHAT_FALLBACK_MODEL, probe_interval=0)
+                elif name.startswith("gemini"):
+                    _fallback_model = model_backends.create_backend(CHAT_FALLBACK_BACKEND, api_key=get_api_key(), system_instruction=SYSTEM_INSTRUCTION,
+                                                                    model_name=CHAT_FALLBACK_MODEL)
+                else:
+                    _fallback_model = model_backends.create_backend(CHAT_FALLBACK_BACKEND)
+            except Exception as e:
+                logger.warning("Fallback model setup failed: %s", e)
+                _fallback_failed = True
+        return _fallback_model
+
+def chat_degraded():
+    """True while the backend's health probe (if it has one) reports the model unreachable."""
+    return bool(getattr(_chat_model, "degraded", False))
+
+def preload_chat_model():
+    """Starts building the chat backend on a background thread, if PORTFOLIO_CHAT_PRELOAD asks for it."""
+    global _preload_started
+    if CHAT_PRELOAD and not _preload_started:
+        _preload_started = True
+        threading.Thread(target=get_chat_model, name="chat-model-preload", daemon=True).start()
+
+# --- TENANTS AND KNOWLEDGE BASE ---
+KB_TOP_K = 5  # Knowledge-base chunks sent with each question
+
+def release_tenant(tenant):
+    """Drops the page fragments built for an evicted tenant."""
+    fragments.discard(f"{tenant.name}:")
+
+@st.cache_resource
+def get_tenants():
+    """Every profile this process serves: the default one (with the persistent answer cache) and tenants loaded on demand."""
+    default = tenants.Tenant(tenants.DEFAULT_TENANT, DEFAULT_PROFILE, answer_cache.AnswerCache(ttl=ANSWER_CACHE_TTL, path=ANSWER_CACHE_PATH))
+    return tenants.TenantRegistry(default, max_tenants=MAX_TENANTS, max_bytes=int(TENANT_MEMORY_MB * 2**20),
+                                  answer_ttl=ANSWER_CACHE_TTL, on_evict=release_tenant)
+
+def get_tenant(name=None):
+    """The tenant called `name`, or the default profile; None if there is no such profile."""
+    return get_tenants().get(name)
+
+def get_relevant_knowledge(query, memory, tenant):
+    """Returns only the knowledge-base chunks relevant to `query`, not the whole profile."""
+    index = tenant.index
+    chunks = index.search(query, k=KB_TOP_K)
+    if not chunks:
+        # Small talk ("tell me about yourself") or a follow-up ("what tech did it use?"):
+        # send the summary plus whatever the previous question was about.
+        chunks = index.chunks[:1] + [c for c in index.search(memory.last_question(), k=KB_TOP_K - 1) if c != index.chunks[0]]
+    return "\n\n".join([tenant.knowledge_header] + chunks)
+
+@st.cache_resource
+def get_scheduler():
+    """The process-wide scheduler every session's Gemini calls go through."""
+    return RequestScheduler(max_concurrency=GEMINI_MAX_CONCURRENCY, requests_per_minute=GEMINI_RPM)
+
+@st.cache_resource
+def get_conversation_store():
+    """The process-wide conversation store shared by every chat session."""
+    return ConversationStore(max_bytes=int(CHAT_MEMORY_MB * 2**20), idle_seconds=CHAT_IDLE_MINUTES * 60, spill_dir=CHAT_SPILL_DIR,
+                             memory_factory=ConversationMemory)
+
+def record_cache_stats():
+    """Publishes the answer caches', tenants', media manifests', scheduler's and conversation store's counters as gauges."""
+    registry, scheduler = get_tenants(), get_scheduler()
+    caches = [tenant.answers for tenant in registry.tenants()]
+    hits, misses = sum(cache.hits for cache in caches), sum(cache.misses for cache in caches)
+    metrics.REGISTRY.set("portfolio_answer_cache_hits", hits)
+    metrics.REGISTRY.set("portfolio_answer_cache_misses", misses)
+    metrics.REGISTRY.set("portfolio_answer_cache_hit_ratio", hits / (hits + misses) if hits + misses else 0.0)
+    metrics.REGISTRY.set("portfolio_tenants", len(registry))
+    metrics.REGISTRY.set("portfolio_tenants_loaded", registry.loads)
+    metrics.REGISTRY.set("portfolio_tenants_evicted", registry.evicted)
+    metrics.REGISTRY.set("portfolio_media_errors", sum(len(tenant.manifest.errors) for tenant in registry.tenants()))
+    for name in ("calls", "coalesced", "retries", "cancelled"):
+        metrics.REGISTRY.set(f"portfolio_gemini_scheduler_{name}", getattr(scheduler, name))
+    if _chat_model is not None:
+        metrics.REGISTRY.set("portfolio_chat_degraded", int(chat_degraded()))
+    store = get_conversation_store()
+    metrics.REGISTRY.set("portfolio_conversations", len(store))
+    metrics.REGISTRY.set("portfolio_conversation_bytes", store.total_bytes)
+    for name in ("spilled", "evicted", "restored"):
+        metrics.REGISTRY.set(f"portfolio_conversations_{name}", getattr(store, name))
+
+def build_message(query, memory, tenant):
+    """The per-turn message: retrieved knowledge, the summary of older turns, then the question."""
+    parts = [f"KNOWLEDGE BASE:\n{get_relevant_knowledge(query, memory, tenant)}"]
+    if memory.summary:
+        parts.append(f"EARLIER IN THIS CONVERSATION:\n{memory.summary}")
+    return "\n\n".join(parts + [f"User Question: {query}"])
+
+def canned_answer(query, tenant):
+    """The last tier: the profile's own words on the topic, when no model answered in time."""
+    if chunks := tenant.index.search(query, k=2):
+        return "I can't reach my AI model right now, but here is what my profile says about that:\n\n" + "\n\n".join(chunks)
+    return "I'm having trouble reaching my AI model right now. Please try again in a few minutes."
+
+def supersede(conversation_id):
+    """Cancels the conversation's request still in progress, if any, and returns the new request's cancel event."""
+    with _requests_lock:
+        if previous := _requests.get(conversation_id):
+            previous.set()
+        cancel = _requests[conversation_id] = threading.Event()
+    return cancel
+
+def first_answer(tiers, request_key, history, message, started, on_wait=None, cancel=None):
+    """Starts the model tiers on their schedule until one of them starts answering.
+
+    `tiers` is [(name, model, start_after_seconds)]. Returns (name, waiter, usage) for the first
+    call with a chunk, every other call cancelled; (None, None, None) if none had one by
+    CHAT_DEADLINE or the request was cancelled. A call that ends without a chunk counts as
+    failed, and the next tier starts at once. Raises the last error if every tier failed.
+    """
+    scheduler = get_scheduler()
+    pending, running, last_error = list(tiers), [], None
+    try:
+        while True:
+            elapsed = time.monotonic() - started
+            # The next tier starts when it is due, or at once if every call so far failed. One that comes
+            # due while a call is still queued is skipped: it would only queue behind it.
+            while pending and (not running or pending[0][2] <= elapsed):
+                name, model, _ = pending.pop(0)
+                if running and any(waiter.position() for _, waiter, _ in running):
+                    continue
+                usage, abort = {}, Abort()
+                # The hedge must not coalesce into the call it is racing.
+                key = request_key if name == "primary" else f"{request_key}:{name}"
+                running.append((name, scheduler.submit(key, partial(model.stream, history, message, usage, abort=abort), abort=abort), usage))
+            for entry in list(running):
+                name, waiter, usage = entry
+                if waiter.started():
+                    running.remove(entry)
+                    return name, waiter, usage
+                if waiter.ready():  # finished without a chunk: an error, or an empty reply
+                    last_error = waiter.error() or RuntimeError("empty reply")
+                    logger.warning("Chat tier %s failed: %s", name, last_error)
+                    running.remove(entry)
+                    waiter.close()
+            if not running and not pending:
+                raise last_error or RuntimeError("no model tier available")
+            if not running:
+                continue
+            if (cancel and cancel.is_set()) or elapsed >= CHAT_DEADLINE:
+                return None, None, None
+            # Queue position while waiting; a call also reports 0 once it runs. Calling on_wait is
+            # also the page's chance to stop this request if the visitor has moved on.
+            position = min(waiter.position() for _, waiter, _ in running)
+            if on_wait:
+                on_wait(position)
+            next_due = pending[0][2] if pending else CHAT_DEADLINE
+            scheduler.wait([waiter for _, waiter, _ in running], timeout=min(1.0, max(next_due, elapsed + 0.05) - elapsed, CHAT_DEADLINE - elapsed))
+    finally:
+        for _, waiter, _ in running:
+            waiter.close()
+
+def stream_chatbot_response(query, memory, on_wait=None, tenant=None, conversation_id=None):
+    """Yields the reply to `query` chunk by chunk as Gemini generates it, answering as `tenant` (default profile if None).
+
+    `on_wait(position)` is called about every second while the reply hasn't started, with the
+    request's queue position (0 once the model has it). A new request for the same
+    `conversation_id` cancels this one.
+    """
+    tenant = tenant or get_tenant()
+    cancel = supersede(conversation_id) if conversation_id else None
+    try:
+        yield from _respond(query, memory, on_wait, tenant, cancel)
+    finally:
+        if conversation_id:
+            with _requests_lock:
+                if _requests.get(conversation_id) is cancel:
+                    del _requests[conversation_id]
+
+def _respond(query, memory, on_wait, tenant, cancel):
+    with metrics.span("get_chatbot_response"):
+        # Only a question with no conversation before it has an answer that doesn't depend on the session.
+        fresh = not memory.turns and not memory.summary
+        # Factual lookups (CGPA, certifications, skills...) are answered from the data, even without an API key;
+        # a follow-up may refer back to the conversation, so it goes to the model.
+        if fresh and (routed := intent_router.route(query, tenant.profile)):
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="router")
+            yield routed
+            return
+        cache_key = answer_cache.make_key(query, tenant.knowledge_base) if fresh else None
+        if cache_key and (cached := tenant.answers.get(cache_key)) is not None:
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="cache")
+            yield cached
+            return
+        chat_model, fallback_model = get_chat_model(), get_fallback_model()
+        if not chat_model and not fallback_model:
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="unavailable")
+            yield "The chatbot is currently unavailable. Please check the API key configuration."
+            return
+        tiers = []
+        # While the health probe says the model is unreachable, go straight to the fallback tiers.
+        if chat_model and not chat_degraded():
+            tiers += [("primary", chat_model, 0), ("hedge", chat_model, CHAT_HEDGE_AFTER)]
+        if fallback_model:
+            tiers.append(("fallback", fallback_model, CHAT_FALLBACK_AFTER if tiers else 0))
+        history, message = memory.history(), build_message(query, memory, tenant)
+        # Identical requests (same history and message) already in flight share one call.
+        request_key = hashlib.sha256(repr((history, message)).encode()).hexdigest()
+        started = time.monotonic()
+        try:
+            tier, waiter, usage = first_answer(tiers, request_key, history, message, started, on_wait, cancel) if tiers else (None, None, None)
+        except Exception as e:
+            logger.warning("Every chat tier failed: %s", e)
+            tier, waiter, usage = None, None, None
+        if cancel and cancel.is_set():
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="cancelled")
+            return
+        metrics.REGISTRY.observe("portfolio_chat_tier_seconds", time.monotonic() - started, tier=tier or "canned")
+        if waiter is None:
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="canned")
+            yield canned_answer(query, tenant)
+            return
+
+        metrics.REGISTRY.observe("portfolio_gemini_first_chunk_seconds", time.monotonic() - started)
+        metrics.record("gemini_first_chunk_ms", (time.monotonic() - started) * 1000)
+        metrics.record(f"chat_tier_{tier}", 1)
+        chunks = []
+        try:
+            for text in waiter.chunks(on_wait=on_wait, timeout=CHAT_DEADLINE, cancel=cancel):
+                chunks.append(text)
+                yield text
+        except Exception as e:
+            logger.warning("Chat tier %s failed mid-stream: %s", tier, e)
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="error")
+            # Keep whatever already reached the visitor and say the rest was lost.
+            yield "\n\n*Sorry, the response was interrupted.*" if chunks else "Sorry, an error occurred."
+            return
+        finally:
+            waiter.close()
+        if cancel and cancel.is_set():
+            metrics.REGISTRY.inc("portfolio_chat_answers_total", source="cancelled")
+            return
+        metrics.REGISTRY.observe("portfolio_gemini_seconds", time.monotonic() - started)
+        metrics.record("gemini_ms", (time.monotonic() - started) * 1000)
+        for kind, tokens in usage.items():
+            metrics.REGISTRY.inc("portfolio_gemini_tokens_total", tokens, kind=kind)
+            metrics.record(f"{kind}_tokens", tokens)
+        metrics.REGISTRY.inc("portfolio_chat_answers_total", source="gemini" if tier == "primary" else tier)
+        # The fallback model's answers aren't cached, so the next visitor gets the main model's.
+        if cache_key and tier != "fallback":
+            tenant.answers.put(cache_key, "".join(chunks))
+
+def get_chatbot_response(query, memory, tenant=None):
+    return "".join(stream_chatbot_response(query, memory, tenant=tenant))
@@ -0,0 +1,137 @@
+"""Process-wide store of every session's conversation, with a memory budget and idle-session eviction.
+
+Sessions only hold a conversation id; the ConversationMemory itself lives here,
+so the store can account for the memory all conversations use together. A
+conversation idle for longer than `idle_seconds`, or the least recently active
+one while the total is over `max_bytes`, is spilled to a JSON file in
+`spill_dir` (and reloaded if its session comes back) or, without a spill
+directory, dropped.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from memory import ConversationMemory
+
+SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ConversationStore:
+    def __init__(self, max_bytes=64 * 2**20, idle_seconds=1800, spill_dir=None, spill_ttl=24 * 3600,
+                 sweep_interval=30, memory_factory=ConversationMemory, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.spill_dir = spill_dir
+        self.spill_ttl = spill_ttl
+        self.sweep_interval = sweep_interval
+        self.memory_factory = memory_factory
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conversations = OrderedDict()  # id -> ConversationMemory, least recently active first
+        self._last_sweep = clock()
+        self.total_bytes = 0
+        self.spilled = 0
+        self.evicted = 0
+        self.restored = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._conversations)
+
+    def get(self, conversation_id, factory=None):
+        """The conversation for `conversation_id`: in memory, restored from a spill file, or new from `factory`."""
+        if not SAFE_ID.match(conversation_id):
+            raise ValueError(f"Invalid conversation id {conversation_id!r}")
+        with self._lock:
+            memory = self._touch(conversation_id, factory)
+            expire = self._sweep()
+        if expire:
+            self._expire_spills()
+        return memory
+
+    def add_turn(self, conversation_id, user, model, factory=None):
+        """Records a turn in the canonical conversation and keeps the store within its budget.
+
+        If the conversation was dropped since `get` (without a spill directory), it starts
+        again from `factory`, as `get` would have.
+        """
+        with self._lock:
+            memory = self._touch(conversation_id, factory)
+            before = memory.size()
+            memory.add_turn(user, model)
+            self.total_bytes += memory.size() - before
+            expire = self._sweep()
+        if expire:
+            self._expire_spills()
+        return memory
+
+    def _touch(self, conversation_id, factory=None):
+        memory = self._conversations.get(conversation_id)
+        if memory is None:
+            memory = self._restore(conversation_id) or (factory or self.memory_factory)()
+            self._conversations[conversation_id] = memory
+            self.total_bytes += memory.size()
+        self._conversations.move_to_end(conversation_id)
+        memory.last_active = self.clock()
+        return memory
+
+    def _sweep(self):
+        """Enforces the budget and, every `sweep_interval`, the idle limit; True when spill files are due to expire."""
+        # The most recently active conversation (the caller's) is never the one pushed out.
+        while len(self._conversations) > 1 and self.total_bytes > self.max_bytes:
+            self._remove(next(iter(self._conversations)))
+        now = self.clock()
+        if now - self._last_sweep < self.sweep_interval:
+            return False
+        self._last_sweep = now
+        while self._conversations:
+            conversation_id, memory = next(iter(self._conversations.items()))
+            if now - memory.last_active < self.idle_seconds:
+                break
+            self._remove(conversation_id)
+        return bool(self.spill_dir)
+
+    def _remove(self, conversation_id):
+        memory = self._conversations.pop(conversation_id)
+        self.total_bytes -= memory.size()
+        if self.spill_dir:
+            path = self._spill_path(conversation_id)
+            with open(path + ".tmp", "w") as f:
+                json.dump(memory.to_dict(), f)
+            os.replace(path + ".tmp", path)
+            self.spilled += 1
+        else:
+            self.evicted += 1
+
+    def _restore(self, conversation_id):
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(conversation_id)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            os.remove(path)
+        except FileNotFoundError:  # never spilled, or expired meanwhile
+            return None
+        self.restored += 1
+        memory = self.memory_factory()
+        return type(memory).from_dict(data, keep_turns=memory.keep_turns, token_budget=memory.token_budget,
+                                      summary_budget=memory.summary_budget, max_messages=memory.max_messages,
+                                      max_bytes=memory.max_bytes)
+
+    def _expire_spills(self):
+        """Deletes spill files older than `spill_ttl`. Runs outside the lock, so requests don't wait on the directory scan."""
+        cutoff = time.time() - self.spill_ttl
+        for entry in os.scandir(self.spill_dir):
+            try:
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:  # restored (or expired by another thread) meanwhile
+                pass
+
+    def _spill_path(self, conversation_id):
+        return os.path.join(self.spill_dir, f"{conversation_id}.json")
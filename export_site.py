@@ -0,0 +1,219 @@
+"""Exports the portfolio as a self-contained static site; only the chat needs a Python process.
+
+Renders the same data (profile_data.py, or a tenant's profile.json) and theme
+(styles.py) as main.py into plain HTML, a stylesheet, a small chat script and the
+resized media, all under content-hashed names so a CDN can cache them forever.
+The chat widget posts to the endpoint served by chat_server.py, naming the
+tenant it was exported for:
+
+    python export_site.py [--out site] [--chat-url /api/chat] [--profile jane-doe]
+    python chat_server.py --static site      # serves both, for local testing
+"""
+import argparse
+import hashlib
+import html
+import os
+import shutil
+import sys
+
+import answer_cache
+import assets
+import fragments
+import tenants
+from profile_data import DEFAULT_PROFILE
+from styles import PAGE_CSS, SITE_CSS
+
+CHAT_JS = """
+(() => {
+  const form = document.getElementById("chat-form");
+  const input = form.querySelector("input");
+  const log = document.getElementById("chat-log");
+  let session = sessionStorage.getItem("chat-session");
+  if (!session) {
+    session = crypto.randomUUID();
+    sessionStorage.setItem("chat-session", session);
+  }
+  const bubble = (role, text) => {
+    const div = document.createElement("div");
+    div.className = `chat-message ${role}`;
+    div.textContent = text;
+    log.appendChild(div);
+    log.scrollTop = log.scrollHeight;
+    return div;
+  };
+  form.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    const message = input.value.trim();
+    if (!message) return;
+    input.value = "";
+    bubble("user", message);
+    const reply = bubble("assistant", "Thinking...");
+    try {
+      const response = await fetch(form.dataset.endpoint, {
+        method: "POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify({session, message, ...(form.dataset.profile && {profile: form.dataset.profile})}),
+      });
+      if (!response.ok) throw new Error(response.status);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let text = "";
+      for (;;) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        text += decoder.decode(value, {stream: true});
+        reply.textContent = text;
+        log.scrollTop = log.scrollHeight;
+      }
+    } catch (error) {
+      reply.textContent = "Sorry, the chat is unavailable right now.";
+    }
+  });
+})();
+"""
+
+
+def fingerprinted(out_dir, stem, ext, content):
+    """Writes `content` to <stem>.<hash>.<ext> and returns the file name."""
+    name = f"{stem}.{hashlib.sha256(content.encode()).hexdigest()[:12]}.{ext}"
+    with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+        f.write(content)
+    return name
+
+
+def image_html(urls, path, variant, attrs=""):
+    if page_urls := urls.get((path, variant)):
+        return assets.picture_tag(page_urls, f' loading="lazy"{attrs}')
+    return ""
+
+
+def card_html(urls, items):
+    cards = []
+    for item in items:
+        if img := image_html(urls, item["image_path"], "card", f' alt="{html.escape(item["title"])}"'):
+            cards.append(f'<div class="cert-award-item">{img}<p><b>{item["title"]}</b></p></div>')
+    return "".join(cards)
+
+
+def render_page(tenant, urls, stylesheet, script, chat_url):
+    """The exported index.html; mirrors the sections of main.py."""
+    p = tenant.profile
+    social = "".join(f'<a href="{url}" target="_blank" rel="noopener">{image_html(urls, path, "icon", f' width="32" alt="{label}"')}</a>'
+                     for label, path, url in p["social_links"])
+    skills = "".join(f"<h3>{category}</h3>{fragments.tags(items)}" for category, items in p["technical_skills"].items())
+    experience = "".join(f"<details open><summary>{title}</summary><ul>{''.join(f'<li>{point}</li>' for point in points)}</ul></details>"
+                         for title, points in p["professional_experience"].items())
+    projects = "".join(f"<details><summary>{title}</summary><p>{details['description']}</p>"
+                       f"<p><b>Technologies:</b> {fragments.tags(details['tech'])}</p></details>" for title, details in p["projects"].items())
+    education = p["education"]
+    # The default profile is the endpoint's default too, so only a tenant's site names itself.
+    profile_attr = f' data-profile="{html.escape(tenant.name)}"' if tenant.name != tenants.DEFAULT_TENANT else ""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(p['name'])} | {html.escape(p['role'].split(' | ')[0])}</title>
+<meta name="description" content="{html.escape(p['professional_summary'].strip()[:155])}">
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+<div class="layout">
+<main>
+<nav>
+<a href="#professional-summary">Summary</a><a href="#technical-skills">Skills</a><a href="#professional-experience">Experience</a>
+<a href="#projects-handled">Projects</a><a href="#certifications">Certifications</a><a href="#awards">Badges</a>
+<a href="#education">Education</a><a href="#soft-skills">Soft Skills</a>
+</nav>
+<section class="header">
+<div class="profile-img">{image_html(urls, p['profile_photo_path'], "profile", f' alt="{html.escape(p["name"])}"')}</div>
+<div>
+<h1>{html.escape(p['name'])}</h1>
+<p class="subtitle">{html.escape(p['role'])}</p>
+<p>{html.escape(p['tagline'])}</p>
+<div class="social-icons">{social}</div>
+</div>
+</section>
+<hr>
+<h2 id="professional-summary">👨‍💻 Professional Summary</h2>
+<p>{p['professional_summary'].strip()}</p>
+<hr>
+<h2 id="technical-skills">🛠️ Technical Skills</h2>
+{skills}
+<hr>
+<h2 id="professional-experience">💼 Professional Experience</h2>
+{experience}
+<hr>
+<h2 id="projects-handled">🚀 Projects Handled</h2>
+{projects}
+<hr>
+<div class="cards">
+<div><h2 id="certifications">📜 Certifications</h2>{card_html(urls, p['certifications_data'])}</div>
+<div><h2 id="awards">🏆 Badges</h2>{card_html(urls, p['badges_data'])}</div>
+</div>
+<hr>
+<h2 id="education">🎓 Education</h2>
+<p><b>{education['Degree']}</b> | {education['Institution']} ({education['Graduation Year']}) | CGPA: {education['CGPA']}</p>
+<h2 id="soft-skills">🤝 Soft Skills</h2>
+{fragments.tags(p['soft_skills'])}
+</main>
+<aside class="chat">
+<h3>Chat with {html.escape(tenant.bot_name)} 💬</h3>
+<p>Ask me anything about me!</p>
+<div id="chat-log" class="chat-log"><div class="chat-message assistant">{p['chat_greeting']}</div></div>
+<form id="chat-form" data-endpoint="{html.escape(chat_url)}"{profile_attr}>
+<input type="text" placeholder="Ask a question..." maxlength="2000" aria-label="Your question">
+<button type="submit">Send</button>
+</form>
+</aside>
+</div>
+<script src="{script}" defer></script>
+</body>
+</html>
+"""
+
+
+def load_tenant(name=None, tenants_dir=tenants.TENANTS_DIR):
+    """The tenant to export: the default profile, or tenants/<name>/profile.json."""
+    if not name or name == tenants.DEFAULT_TENANT:
+        return tenants.Tenant(tenants.DEFAULT_TENANT, DEFAULT_PROFILE, answer_cache.AnswerCache())
+    if not tenants.SAFE_NAME.match(name):
+        raise SystemExit(f"{name!r} is not a valid profile name")
+    try:
+        return tenants.Tenant(name, tenants.load_profile(tenants.profile_path(name, tenants_dir)), answer_cache.AnswerCache())
+    except (OSError, ValueError, KeyError) as e:
+        raise SystemExit(f"Could not load profile {name!r}: {e}")
+
+
+def export(out_dir="site", chat_url="/api/chat", tenant=None):
+    """Writes the site for `tenant` (default profile if None) to `out_dir`, replacing it, and returns the list of files written."""
+    tenant = tenant or load_tenant()
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and not os.path.exists(os.path.join(out_dir, "index.html")):
+        raise SystemExit(f"{out_dir} is not empty and doesn't look like an earlier export; refusing to replace it")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    for level, message in tenant.manifest.problems:
+        print(f"{level}: {message}", file=sys.stderr)
+    entries = [(path, variant) for path, variant in tenant.media_variants if path in tenant.manifest]
+    urls = assets.publish_static(assets.build_assets(entries), static_dir=os.path.join(out_dir, "media"), base_url="media")
+    # Entries Pillow couldn't transcode (or isn't installed for) publish their original file.
+    missing = [entry for entry in entries if entry not in urls]
+    urls.update(assets.publish_static({entry: {} for entry in missing}, static_dir=os.path.join(out_dir, "media"), base_url="media"))
+
+    stylesheet = fingerprinted(out_dir, "style", "css", fragments.minify_css(PAGE_CSS + SITE_CSS))
+    script = fingerprinted(out_dir, "chat", "js", CHAT_JS.strip() + "\n")
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(render_page(tenant, urls, stylesheet, script, chat_url))
+    return sorted(os.path.relpath(os.path.join(root, name), out_dir) for root, _, files in os.walk(out_dir) for name in files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="site", help="output directory (replaced)")
+    parser.add_argument("--chat-url", default="/api/chat", help="URL of the chat endpoint, e.g. https://chat.example.com/api/chat")
+    parser.add_argument("--profile", metavar="NAME", help="export this tenant (see tenants.py) instead of the default profile")
+    parser.add_argument("--dir", default=tenants.TENANTS_DIR, help="tenants directory")
+    args = parser.parse_args()
+
+    for name in export(args.out, args.chat_url, load_tenant(args.profile, args.dir)):
+        print(f"{os.path.getsize(os.path.join(args.out, name)) / 1024:8.1f} KB  {name}")
@@ -0,0 +1,47 @@
+"""Precompiled HTML for the page's static sections, rebuilt only when the data they are built from changes.
+
+Every rerun of main.py used to rebuild the same tag spans, cards and style block
+with f-string joins. Here each named fragment is built once per process and kept
+with its source data; later runs get the stored string back and only a change to
+that data (or to the media it references) triggers a rebuild. The check on the
+hot path is a plain equality test against the stored source, which is much
+cheaper than hashing it.
+"""
+import re
+import threading
+
+_lock = threading.Lock()
+_fragments = {}  # name -> (source, built value)
+builds = 0
+
+
+def compiled(name, build, *source):
+    """Returns build(*source), calling it only when `source` differs from the last build of `name`."""
+    global builds
+    with _lock:
+        cached = _fragments.get(name)
+    if cached and cached[0] == source:
+        return cached[1]
+    value = build(*source)
+    with _lock:
+        _fragments[name] = (source, value)
+        builds += 1
+    return value
+
+
+def discard(prefix):
+    """Drops every fragment whose name starts with `prefix`, e.g. an evicted tenant's."""
+    with _lock:
+        for name in [name for name in _fragments if name.startswith(prefix)]:
+            del _fragments[name]
+
+
+def minify_css(css):
+    """Drops comments and collapses whitespace; enough for the hand-written style block in main.py."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+def tags(items, css_class="skill-tag"):
+    return "".join(f'<span class="{css_class}">{item}</span>' for item in items)
@@ -0,0 +1,193 @@
+"""Process-wide Gemini REST client: pooled keep-alive connections, warm-up and health probing.
+
+Talks to the Generative Language REST API directly over one requests.Session, so
+every session's chat reuses the same pool of open TLS connections instead of
+whatever the SDK sets up per call. A background probe (a cheap model-metadata GET)
+keeps a connection warm across idle periods and marks the client degraded after
+repeated failures, so the chat can say so before visitors wait on a dead upstream.
+
+PORTFOLIO_GEMINI_BASE_URL points the client somewhere else, e.g. at
+gemini_standin.py for local testing.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+BASE_URL = os.environ.get("PORTFOLIO_GEMINI_BASE_URL", DEFAULT_BASE_URL)
+API_VERSION = "v1beta"
+
+logger = logging.getLogger("portfolio")
+
+
+class GeminiAPIError(Exception):
+    """An error response from the API; `code` is the HTTP status the scheduler retries on."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+def _disconnect(response):
+    """Shuts down a streaming response's socket, so a read blocked on it returns at once (closing it doesn't)."""
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class GeminiClient:
+    """One pooled client for the whole process.
+
+    pool_size:        open connections kept to the API (should cover the scheduler's concurrency)
+    connect_timeout:  seconds to establish a connection
+    read_timeout:     seconds to wait for the next bytes of a response
+    probe_interval:   seconds between health probes; 0 disables them
+    degraded_after:   consecutive failures (probes or calls) before the client reports degraded
+    degraded_for:     without a probe, seconds after the last failure that the client stays degraded
+                      before callers may try it again
+    """
+
+    def __init__(self, api_key, model_name="gemini-1.5-flash", system_instruction=None, base_url=BASE_URL,
+                 pool_size=8, connect_timeout=5.0, read_timeout=60.0, probe_interval=60.0, degraded_after=2, degraded_for=30.0):
+        if not api_key:
+            raise ValueError("GeminiClient needs an API key")
+        self.api_key = api_key
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.probe_interval = probe_interval
+        self.degraded_after = degraded_after
+        self.degraded_for = degraded_for
+
+        self.session = requests.Session()
+        self.session.headers.update({"x-goog-api-key": api_key, "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=int(pool_size), max_retries=0)
+        self.session.mount(self.base_url, adapter)
+
+        self._lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.last_failure = None  # monotonic time
+        self.last_probe = None  # (monotonic time, ok, seconds)
+        self._probe_thread = None
+        self._stop = threading.Event()
+
+    # --- health ---
+    @property
+    def degraded(self):
+        """Whether callers should fail fast.
+
+        With a probe running, until a probe (or call) succeeds. Without one nothing would
+        clear it, so it lapses `degraded_for` seconds after the last failure and the next
+        call tests the API again.
+        """
+        with self._lock:
+            if self.consecutive_failures < self.degraded_after:
+                return False
+            return self._probe_thread is not None or time.monotonic() - self.last_failure < self.degraded_for
+
+    def _record(self, ok):
+        with self._lock:
+            was_degraded = self.consecutive_failures >= self.degraded_after
+            self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+            if not ok:
+                self.last_failure = time.monotonic()
+            now_degraded = self.consecutive_failures >= self.degraded_after
+        if now_degraded != was_degraded:
+            logger.warning("Gemini client %s", "degraded" if now_degraded else "recovered")
+
+    def probe(self):
+        """One lightweight request (the model's metadata, no tokens used); returns (ok, seconds)."""
+        started = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/{API_VERSION}/models/{self.model_name}", timeout=(self.timeout[0], 10))
+            ok = response.status_code < 500 and response.status_code != 429
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        self.last_probe = (time.monotonic(), ok, elapsed)
+        self._record(ok)
+        return ok, elapsed
+
+    def warm_up(self):
+        """Opens a pooled connection (DNS, TCP, TLS) ahead of the first chat message."""
+        return self.probe()
+
+    def start(self, warm_up=False):
+        """Optionally warms up, then starts the background health probe (once)."""
+        if warm_up:
+            self.warm_up()
+        if self.probe_interval and self._probe_thread is None and not self._stop.is_set():
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="gemini-health-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        while not self._stop.wait(self.probe_interval):
+            self.probe()
+
+    # --- generation ---
+    def _request_body(self, history, message):
+        contents = [{"role": turn["role"], "parts": [{"text": part} for part in turn["parts"]]} for turn in history]
+        contents.append({"role": "user", "parts": [{"text": message}]})
+        body = {"contents": contents}
+        if self.system_instruction:
+            body["systemInstruction"] = {"parts": [{"text": self.system_instruction}]}
+        return body
+
+    def stream(self, history, message, usage, abort=None):
+        """Yields the reply's text chunks as they arrive (server-sent events) and fills `usage` with token counts.
+
+        `abort` (scheduler.Abort) disconnects the response from another thread, ending the call quietly.
+        """
+        url = f"{self.base_url}/{API_VERSION}/models/{self.model_name}:streamGenerateContent"
+        try:
+            response = self.session.post(url, params={"alt": "sse"}, json=self._request_body(history, message),
+                                         stream=True, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._record(False)
+            raise GeminiAPIError(503, f"connection failed: {e}") from e
+        with response:
+            if response.status_code != 200:
+                self._record(response.status_code < 500 and response.status_code != 429)
+                raise GeminiAPIError(response.status_code, response.text[:200])
+            if abort:
+                abort.on_abort(lambda: _disconnect(response))
+            try:
+                # Server-sent events are always UTF-8; without a charset requests would decode them as ISO-8859-1.
+                for line in response.iter_lines():
+                    line = line.decode("utf-8")
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    if meta := event.get("usageMetadata"):
+                        usage.update(prompt=meta.get("promptTokenCount", 0), response=meta.get("candidatesTokenCount", 0))
+                    for candidate in event.get("candidates", [])[:1]:
+                        if text := "".join(part.get("text", "") for part in candidate.get("content", {}).get("parts", [])):
+                            yield text
+            except Exception as e:
+                if abort and abort.aborted:  # closed by the scheduler: nobody is waiting for the rest
+                    return
+                if not isinstance(e, requests.RequestException):
+                    raise
+                self._record(False)
+                raise GeminiAPIError(503, f"stream interrupted: {e}") from e
+        if not (abort and abort.aborted):
+            self._record(True)
+
+    def close(self):
+        """Stops the health probe and closes the pooled connections."""
+        self._stop.set()
+        if thread := self._probe_thread:
+            thread.join(timeout=self.timeout[0] + 10)
+            with self._lock:
+                self._probe_thread = None
+        self.session.close()
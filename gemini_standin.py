@@ -0,0 +1,134 @@
+"""Local stand-in for the Gemini REST API, for testing gemini_client.py without a key or network.
+
+Implements the two calls the client makes: the model-metadata GET (health probe)
+and streamGenerateContent with server-sent events. It counts TCP connections
+separately from requests, so connection reuse is visible, and can be switched
+down (503 for everything) to exercise degraded marking:
+
+    python gemini_standin.py --port 8090 --latency 0.3
+    PORTFOLIO_GEMINI_BASE_URL=http://localhost:8090 GOOGLE_API_KEY=x streamlit run main.py
+
+    GET  /_standin/stats                  {"connections": n, "requests": n, "mode": "up"}
+    POST /_standin/mode  {"mode": "down"}  switch between "up" and "down"
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODEL_PATH = re.compile(r"^/v1beta/models/([\w.-]+)(:streamGenerateContent)?(\?.*)?$")
+
+
+class StandinState:
+    def __init__(self, latency=0.2, chunk_delay=0.02, words=40):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.words = words
+        self.mode = "up"
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def count(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = StandinState()
+
+    def setup(self):
+        super().setup()
+        self.state.count("connections")
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        return json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/_standin/stats":
+            self.send_json(200, {"connections": self.state.connections, "requests": self.state.requests, "mode": self.state.mode})
+            return
+        self.state.count("requests")
+        match = MODEL_PATH.match(self.path)
+        if self.state.mode == "down":
+            self.send_json(503, {"error": {"code": 503, "message": "The service is currently unavailable (stand-in)."}})
+        elif match and not match.group(2):
+            self.send_json(200, {"name": f"models/{match.group(1)}", "displayName": match.group(1)})
+        else:
+            self.send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_POST(self):
+        if self.path == "/_standin/mode":
+            self.state.mode = self.read_json().get("mode", "up")
+            self.send_json(200, {"mode": self.state.mode})
+            return
+        self.state.count("requests")
+        request = self.read_json()
+        match = MODEL_PATH.match(self.path)
+        if self.state.mode == "down":
+            self.send_json(503, {"error": {"code": 503, "message": "The service is currently unavailable (stand-in)."}})
+            return
+        if not (match and match.group(2)):
+            self.send_json(404, {"error": {"code": 404, "message": "not found"}})
+            return
+
+        question = request["contents"][-1]["parts"][0]["text"].rsplit("User Question:", 1)[-1].strip()
+        words = f"(Stand-in answer to: {question})".split() + ["lorem"] * max(0, self.state.words - 5)
+        time.sleep(self.state.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i in range(0, len(words), 5):
+                event = {"candidates": [{"content": {"role": "model", "parts": [{"text": " ".join(words[i:i + 5]) + " "}]}}]}
+                if i + 5 >= len(words):
+                    event["usageMetadata"] = {"promptTokenCount": len(json.dumps(request)) // 4, "candidatesTokenCount": len(words)}
+                # Raw UTF-8 like the real API, not \u escapes.
+                self.write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode())
+                time.sleep(self.state.chunk_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):  # the client cancelled mid-stream
+            self.close_connection = True
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, **options):
+    """Starts the stand-in on a background thread; returns (server, state)."""
+    StandinHandler.state = StandinState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, StandinHandler.state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.02)
+    parser.add_argument("--words", type=int, default=40, help="length of each reply")
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, latency=args.latency, chunk_delay=args.chunk_delay, words=args.words)
+    print(f"Gemini stand-in on http://127.0.0.1:{args.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,139 @@
+"""Local intent router: answers factual profile lookups from the data, without calling the LLM.
+
+`profile` is a profile dict (profile_data.DEFAULT_PROFILE or a tenant's, see tenants.py); the router reads
+(`education`, `certifications_data`, `technical_skills`, `professional_experience`,
+`soft_skills`). Only a question that is a plain lookup, as a whole, is answered; anything else
+returns None and goes to the model.
+"""
+import re
+
+# Each pattern must match the whole question (see _normalize), so one that asks for anything more specific
+# ("your marks in 12th grade", "your skills as a leader", "how many years of experience") goes to the model.
+LEAD_IN = r"(?:(?:hi|hey|so|and|ok|okay|please|can you tell me|could you tell me|tell me) )*"
+WHAT_IS = r"what(?: is| s|s| was)"
+
+INTENTS = [
+    ("cgpa", rf"(?:{WHAT_IS} )?your c?gpa|what c?gpa did you (?:get|score|graduate with)|what were your (?:college |university )?grades"),
+    ("education", rf"(?:{WHAT_IS} )?your (?:education|educational background|degree|highest (?:degree|qualification)|qualifications?|alma mater)"
+                  r"|where did you (?:study|graduate(?: from)?|go to college)|what did you study|when did you graduate"),
+    ("certifications", r"(?:what|which) certifications do you (?:have|hold)|do you have any certifications|how many certifications do you (?:have|hold)"
+                       r"|(?:what are |list )?your certifications|are you certified"),
+    ("soft_skills", r"(?:what are |list )?your (?:soft|interpersonal|people) skills|what soft skills do you have"),
+    ("experience", rf"where do you (?:currently )?work|where are you (?:currently )?working|who do you work for|which company do you work (?:for|at)"
+                   rf"|(?:{WHAT_IS} )?your (?:current )?(?:job|role|company|position|employer|job title)|where have you worked|when did you join"),
+    ("technical_skills", rf"(?:what are |list )?your (?:(?P<area>[\w&]+(?: [\w&]+)?) )?skills|(?:{WHAT_IS} )?your (?:skill ?set|tech stack|stack)"
+                         r"|(?:what|which) (?:programming )?(?P<languages>languages) do you (?:use|know|code in|program in)"
+                         r"|(?:what|which) (?:tools|technologies|frameworks|platforms) do you (?:use|know|work with)"),
+]
+INTENTS = [(intent, re.compile(rf"{LEAD_IN}(?:{pattern})(?: please)?")) for intent, pattern in INTENTS]
+
+# Words in "what are your ... skills" that don't name an area.
+GENERAL_SKILL_WORDS = {"technical", "tech", "main", "key", "top", "core", "professional", "hard"}
+# Spelled-out forms of the abbreviations used in skill category names.
+CATEGORY_ALIASES = {"ml": "machine learning", "ai": "artificial intelligence", "bi": "business intelligence"}
+
+
+def _normalize(question):
+    """Lowercase words separated by single spaces, without punctuation: "What's your CGPA?" -> "what s your cgpa"."""
+    return " ".join(re.sub(r"[^\w&]+", " ", question.lower()).split())
+
+
+def _title_phrases(profile):
+    """Two-word phrases of the profile's project titles, e.g. "image classification"."""
+    phrases = set()
+    for title in profile.get("projects", {}):
+        words = re.findall(r"[a-z0-9]+", title.lower())
+        phrases |= {f"{a} {b}" for a, b in zip(words, words[1:])}
+    return phrases
+
+
+def names_project(question, profile):
+    """Whether `question` is about one of the projects, which the templated answers know nothing about."""
+    text = " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+    return bool(re.search(r"\bprojects?\b", text)) or any(re.search(rf"\b{phrase}\b", text) for phrase in _title_phrases(profile))
+
+
+def _category_words(category):
+    """Words naming a skill category, e.g. "☁️ Cloud & DevOps" -> {"cloud", "devops"}, "🤖 ML & AI" -> {"ml", "machine learning", ...}."""
+    words = set(re.findall(r"[a-z]+", category.lower()))
+    words |= {word[:-1] for word in words if word.endswith("s")}
+    words |= {CATEGORY_ALIASES[word] for word in words if word in CATEGORY_ALIASES}
+    if "programming" in words:
+        words |= {"language", "languages", "coding"}
+    return words
+
+
+def _match(question):
+    """The first (intent, match) whose pattern matches the whole question, or (None, None)."""
+    text = _normalize(question)
+    for intent, pattern in INTENTS:
+        if match := pattern.fullmatch(text):
+            return intent, match
+    return None, None
+
+
+def classify(question):
+    """Returns the name of the factual intent `question` asks for, or None if it asks anything else."""
+    return _match(question)[0]
+
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items)
+
+
+def answer_cgpa(match, profile):
+    edu = profile["education"]
+    return f"I graduated with a CGPA of **{edu['CGPA']}** in my {edu['Degree']} from {edu['Institution']} ({edu['Graduation Year']})."
+
+
+def answer_education(match, profile):
+    edu = profile["education"]
+    return f"I hold a **{edu['Degree']}** from {edu['Institution']}, graduating in {edu['Graduation Year']} with a CGPA of {edu['CGPA']}."
+
+
+def answer_certifications(match, profile):
+    certs = profile["certifications_data"]
+    return f"I hold {len(certs)} certifications:\n" + _bullets(f"**{cert['title']}**" for cert in certs)
+
+
+def answer_soft_skills(match, profile):
+    return "My key soft skills are:\n" + _bullets(profile["soft_skills"])
+
+
+def answer_experience(match, profile):
+    roles = list(profile["professional_experience"])
+    if len(roles) == 1:
+        return f"I work as a **{roles[0]}**."
+    return "Here's my professional experience:\n" + _bullets(f"**{role}**" for role in roles)
+
+
+def answer_technical_skills(match, profile):
+    """All skills by category, or one category's; None if the question names an area no category covers."""
+    skills = profile["technical_skills"]
+    area = " ".join(word for word in (match.group("area") or match.group("languages") or "").split() if word not in GENERAL_SKILL_WORDS)
+    if not area:
+        return "Here are my technical skills by area:\n" + "\n".join(f"- **{cat}**: {', '.join(items)}" for cat, items in skills.items())
+    matched = {cat: items for cat, items in skills.items()
+               if any(re.search(rf"\b{re.escape(word)}\b", area) for word in _category_words(cat.split(" ", 1)[-1]))}
+    if len(matched) != 1:
+        return None
+    category, items = next(iter(matched.items()))
+    return f"Here are my skills in **{category.split(' ', 1)[-1]}**:\n" + _bullets(items)
+
+
+ANSWERS = {
+    "cgpa": answer_cgpa,
+    "education": answer_education,
+    "certifications": answer_certifications,
+    "soft_skills": answer_soft_skills,
+    "experience": answer_experience,
+    "technical_skills": answer_technical_skills,
+}
+
+
+def route(question, profile):
+    """Returns a templated answer for a factual lookup, or None to send the question to the model."""
+    if names_project(question, profile):
+        return None
+    intent, match = _match(question)
+    return ANSWERS[intent](match, profile) if intent else None
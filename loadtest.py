@@ -0,0 +1,131 @@
+"""Offline load test: many concurrent visitor sessions against the fake chat backend.
+
+Starts `streamlit run main.py` with PORTFOLIO_CHAT_BACKEND=fake (no quota spent),
+then simulates visitors who load the page, rerun it while browsing and send a few
+chat messages with think time in between. Reports p50/p99 rerun and chat-turn
+latency, throughput, errors and server memory per session (Linux only).
+
+    python loadtest.py --sessions 200 --turns 3 --backend "fake:latency=0.8,error_rate=0.02"
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from st_client import Session, server_rss_bytes, start_server
+
+QUESTIONS = [
+    "What's your CGPA?",
+    "Which certifications do you have?",
+    "Tell me about your projects",
+    "What did you build with LangChain?",
+    "How did you boost team productivity at Merkle?",
+    "Explain the customer service chatbot you built",
+    "What are your skills?",
+    "Why are you interested in agentic AI?",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Results:
+    def __init__(self):
+        self.reruns, self.turns, self.errors = [], [], 0
+        self.connected = 0
+
+
+async def warm_up(port):
+    """Runs the page once so imports and the asset build aren't counted against the first visitors."""
+    session = await Session.connect(port)
+    await session.rerun()
+    await session.close()
+
+
+async def visitor(port, args, results):
+    await asyncio.sleep(random.uniform(0, args.ramp_up))
+    try:
+        session = await Session.connect(port)
+    except Exception:
+        results.errors += 1
+        return
+    try:
+        started = time.perf_counter()
+        await session.rerun()
+        results.reruns.append(time.perf_counter() - started)
+        results.connected += 1
+        for _ in range(args.reruns):
+            await asyncio.sleep(random.uniform(0, args.think_time))
+            started = time.perf_counter()
+            await session.rerun()
+            results.reruns.append(time.perf_counter() - started)
+        for _ in range(args.turns):
+            await asyncio.sleep(random.uniform(0, args.think_time))
+            started = time.perf_counter()
+            await asyncio.wait_for(session.chat(random.choice(QUESTIONS)), timeout=args.timeout)
+            results.turns.append(time.perf_counter() - started)
+    except Exception:
+        results.errors += 1
+    finally:
+        await session.close()
+
+
+async def sample_peak_rss(pid, stop):
+    peak = server_rss_bytes(pid)
+    while not stop.is_set():
+        peak = max(peak, server_rss_bytes(pid))
+        await asyncio.sleep(0.2)
+    return peak
+
+
+async def run(port, pid, args):
+    results, stop = Results(), asyncio.Event()
+    baseline_rss = server_rss_bytes(pid)
+    sampler = asyncio.create_task(sample_peak_rss(pid, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(visitor(port, args, results) for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return results, elapsed, baseline_rss, await sampler
+
+
+def report(results, elapsed, baseline_rss, peak_rss, sessions):
+    def line(label, values):
+        ms = [v * 1000 for v in values]
+        return f"{label:12} n={len(ms):5}  p50={percentile(ms, 50):8.1f} ms  p99={percentile(ms, 99):8.1f} ms  mean={statistics.fmean(ms) if ms else float('nan'):8.1f} ms"
+
+    print(line("rerun", results.reruns))
+    print(line("chat turn", results.turns))
+    print(f"throughput   {len(results.reruns) / elapsed:.1f} reruns/s, {len(results.turns) / elapsed:.1f} chat turns/s over {elapsed:.1f} s")
+    print(f"errors       {results.errors} of {sessions} sessions")
+    print(f"memory       {baseline_rss / 2**20:.0f} MB idle, {peak_rss / 2**20:.0f} MB peak, "
+          f"~{(peak_rss - baseline_rss) / max(1, results.connected) / 1024:.0f} KB per session")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--reruns", type=int, default=2, help="full page reruns per visitor while browsing")
+    parser.add_argument("--turns", type=int, default=3, help="chat messages per visitor")
+    parser.add_argument("--think-time", type=float, default=2.0, help="max seconds between a visitor's actions")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds over which visitors arrive")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a chat turn counts as failed")
+    parser.add_argument("--backend", default="fake", help="PORTFOLIO_CHAT_BACKEND for the server")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra server environment, e.g. PORTFOLIO_GEMINI_RPM=100000")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    env = dict(item.split("=", 1) for item in args.env)
+    env["PORTFOLIO_CHAT_BACKEND"] = args.backend
+    server = start_server(args.port, env=env)
+    try:
+        asyncio.run(warm_up(args.port))
+        report(*asyncio.run(run(args.port, server.pid, args)), args.sessions)
+    finally:
+        server.terminate()
+        server.wait()
@@ -1,179 +1,145 @@
 import streamlit as st
 import base64
+import logging
 import os
-import google.generativeai as genai
+import re
+import time
+import uuid
+import assets
+import chatbot
+import fragments
+import metrics
+from memory import ConversationMemory
+from styles import PAGE_CSS
+from chatbot import stream_chatbot_response
 
-# --- PATHS AND CONFIGURATION ---
-MEDIA_DIR = "media"
-PROFILE_PHOTO_PATH = os.path.join(MEDIA_DIR, "profile-photo.jpg")
-LINKEDIN_ICON_PATH = os.path.join(MEDIA_DIR, "linkedin.png")
-GMAIL_ICON_PATH = os.path.join(MEDIA_DIR, "gmail.png")
-GITHUB_ICON_PATH = os.path.join(MEDIA_DIR, "github.png")
-CERTIFICATIONS_DIR = os.path.join(MEDIA_DIR, "certifications")
-AWARDS_DIR = os.path.join(MEDIA_DIR, "awards")
-BADGES_DIR = os.path.join(MEDIA_DIR, "badges")
+# Times this script run; finished (and exported) at the bottom of the script.
+metrics.start_run("page")
 
+# --- TENANT ---
+# ?profile=<name> serves that tenant's portfolio (tenants/<name>/profile.json); without it, the default one.
+tenant = chatbot.get_tenant(st.query_params.get("profile"))
+if tenant is None:
+    st.set_page_config(page_title="Profile not found")
+    st.error(f"There is no profile called {st.query_params.get('profile')!r}.")
+    st.stop()
+profile = tenant.profile
 
 # --- PAGE CONFIG ---
 st.set_page_config(
     layout="wide",
-    page_title="Nizaal Khot | AI/ML Engineer",
+    page_title=f"{profile['name']} | {profile['role'].split(' | ')[0]}",
     initial_sidebar_state="collapsed"
 )
 
-# --- GOOGLE AI SETUP ---
-try:
-    genai.configure(api_key=st.secrets["GOOGLE_API_KEY"])
-    GEMINI_MODEL = genai.GenerativeModel('gemini-1.5-flash')
-except Exception:
+# "static" serves media as fingerprinted files from ./static (cacheable by the browser);
+# "inline" embeds them as base64 data URIs. Defaults to static when Streamlit static serving is on.
+MEDIA_MODE = os.environ.get("PORTFOLIO_MEDIA_MODE") or ("static" if st.get_option("server.enableStaticServing") else "inline")
+# Base URL for the published media, e.g. a CDN in front of the app.
+MEDIA_URL = os.environ.get("PORTFOLIO_MEDIA_URL", assets.STATIC_URL)
+# Static media is served through <picture> (AVIF, then WebP); inline media is embedded as WebP only.
+MEDIA_FORMATS = assets.FORMATS if MEDIA_MODE == "static" else assets.INLINE_FORMATS
+
+# Set PORTFOLIO_CHAT_FRAGMENT=0 to rerun the whole page on every chat turn, as the app used
+# to; measure_chat_cpu.py compares the two.
+CHAT_FRAGMENT = os.environ.get("PORTFOLIO_CHAT_FRAGMENT", "1") != "0"
+# Newest messages drawn as chat bubbles; earlier ones load this many at a time on request.
+CHAT_WINDOW = int(os.environ.get("PORTFOLIO_CHAT_WINDOW", 20))
+
+logger = logging.getLogger("portfolio")
+
+if not chatbot.chat_configured():
     st.error("Error configuring Google AI API. Make sure your GOOGLE_API_KEY is set in st.secrets.", icon="🚨")
-    GEMINI_MODEL = None
 
 
 # --- HELPER FUNCTIONS ---
+def render_html(body):
+    """Emits raw HTML via st.markdown, counting its size toward the run's rendered bytes."""
+    metrics.record("html_bytes", len(body.encode()))
+    st.markdown(body, unsafe_allow_html=True)
+
 def get_image_as_base64(path):
     """Encodes an image file to a base64 string for embedding in HTML/CSS."""
-    if not os.path.exists(path):
-        # Don't show an error, just return None. The calling code can handle it.
-        return None
-    try:
-        with open(path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode()
-    except Exception as e:
-        st.warning(f"Could not read image {os.path.basename(path)}: {e}")
+    with metrics.span("get_image_as_base64", path=path):
+        try:
+            with open(path, "rb") as image_file:
+                return base64.b64encode(image_file.read()).decode()
+        except Exception as e:
+            st.warning(f"Could not read image {os.path.basename(path)}: {e}")
+            return None
+
+def get_image_src(path, variant):
+    """Returns a data URI for an image, using its pre-transcoded variant when one was built."""
+    if path not in tenant.manifest:
+        # Missing or unreadable: reported once when the tenant loaded (see media_manifest.py).
         return None
+    src_path = tenant.asset_variants(MEDIA_FORMATS).get((path, variant), {}).get("webp", path)
+    if b64 := get_image_as_base64(src_path):
+        return f"data:{assets.mime_type(src_path)};base64,{b64}"
+    return None
+
+def get_image_html(path, variant, attrs=""):
+    """Returns the tag for an image: a static URL in static media mode, otherwise an inline data URI."""
+    if MEDIA_MODE == "static" and (urls := tenant.static_media_urls(MEDIA_URL).get((path, variant))):
+        return assets.picture_tag(urls, attrs)
+    if src := get_image_src(path, variant):
+        return f'<img src="{src}"{attrs}>'
+    return None
 
 # --- INJECT CUSTOM CSS FOR STYLING ---
+@metrics.span("load_css")
 def load_css():
     """Injects custom CSS into the Streamlit app for theming and a sticky chat column."""
-    st.markdown(f"""
-    <style>
-        /* --- THEME-AWARE VARIABLES --- */
-        :root {{
-            --card-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            --card-hover-shadow: 0 8px 12px rgba(0,0,0,0.15);
-            --selected-tab-bg: #FF4B4B;
-            --selected-tab-color: white;
-            --tag-bg: #FF4B4B;
-            --tag-color: white;
-            --sidebar-width: 320px;
-        }}
-
-
-        /* --- DARK THEME OVERRIDES --- */
-        .stApp[theme="dark"] {{
-            --bg-color: #0e1117;
-            --text-color: #fafafa;
-            --header-color: #fafafa;
-            --card-bg-color: #262730;
-            --card-shadow: 0 4px 6px rgba(0,0,0,0.4);
-            --card-hover-shadow: 0 8px 12px rgba(0,0,0,0.5);
-        }}
-
-        /* --- General & Layout --- */
-        .stApp {{
-            background-color: var(--bg-color);
-            color: var(--text-color);
-        }}
-        h1, h2, h3, h4, h5, h6 {{
-            color: var(--header-color);
-        }}
-        
-        /* --- STICKY, FULL-HEIGHT CHAT COLUMN --- */
-        .fixed-chat-container {{
-            position: sticky;
-            top: 0; /* Stick to the top of the viewport */
-            height: 100vh; /* Full screen height */
-            overflow-y: auto; /* Allow scrolling ONLY within the chat column */
-            display: flex;
-            flex-direction: column;
-            background-color: var(--bg-color); /* Match app background */
-            padding: 1rem;
-        }}
-        
-        /* --- Profile & Socials --- */
-        .profile-img img {{
-            width: 200px;
-            height: 200px;
-            border-radius: 50%;
-            object-fit: cover;
-            border: 5px solid #FF4B4B;
-            box-shadow: 0 0 30px rgba(255, 75, 75, 0.6);
-        }}
-        .social-icons a {{
-            margin: 0 12px;
-            transition: transform 0.3s ease;
-            display: inline-block;
-        }}
-        .social-icons a:hover {{
-            transform: scale(1.25);
-        }}
-
-        /* --- Tags & Expanders --- */
-        .skill-tag {{
-            display: inline-block; padding: 0.5em 1em; margin: 0.3em;
-            background-color: var(--tag-bg); color: var(--tag-color);
-            border-radius: 16px; font-size: 0.9em; font-weight: 500;
-        }}
-        div[data-testid="stExpander"] > div:first-child {{
-            padding: 1rem; border-radius: 0.5rem; background-color: var(--card-bg-color);
-            box-shadow: var(--card-shadow); transition: transform 0.2s, box-shadow 0.2s;
-            margin-bottom: 1rem;
-        }}
-        div[data-testid="stExpander"] > div:first-child:hover {{
-            transform: translateY(-5px); box-shadow: var(--card-hover-shadow);
-        }}
-        div[data-testid="stExpander"] .streamlit-expanderContent {{
-             background-color: var(--card-bg-color); border-radius: 0.5rem;
-             margin-top: -0.5rem; padding: 1.5rem;
-        }}
-        
-        /* --- Certs & Awards --- */
-        .cert-award-item {{
-            text-align: center; padding: 15px; border-radius: 10px;
-            background-color: var(--card-bg-color); box-shadow: var(--card-shadow);
-            transition: transform 0.2s, box-shadow 0.2s; height: 100%;
-        }}
-        .cert-award-item:hover {{
-            transform: translateY(-5px); box-shadow: var(--card-hover-shadow);
-        }}
-        .cert-award-item img {{
-            max-width: 100%; height: 150px; object-fit: contain;
-            border-radius: 8px; margin-bottom: 10px;
-        }}
-    </style>
-    """, unsafe_allow_html=True)
-
-# --- DATA ---
-# (Your data remains the same)
-PROFESSIONAL_SUMMARY = """
-Results-oriented Agentic AI Developer and Generative AI Developer with 3+ years of experience in developing and deploying scalable Machine Learning, Deep Learning, and NLP solutions. My expertise spans the entire AI project lifecycle, from data collection to model deployment and optimization, with a strong focus on leveraging generative AI, NLP, and LLMs for impactful business intelligence, process automation, and predictive analytics. I have a proven track record of developing sophisticated agentic AI systems. Adept at collaborating with cross-functional teams to integrate AI solutions and enhance operational efficiency, I am passionate about driving innovation and delivering scalable, reliable solutions with a strong focus on quality and compliance.
-"""
-TECHNICAL_SKILLS = { "🤖 ML & AI": ["Agentic AI Development", "Generative AI & Prompt Engineering", "LLM Fine-tuning (GPT, Gemini)", "Model Development (Regression, Classification, Clustering)", "NLP (Sentiment Analysis, Topic Modeling)", "Statistical Analysis & Feature Engineering"], "🧠 Frameworks": ["LangChain", "LangGraph", "TensorFlow", "Scikit-learn", "PyTorch", "Pandas", "NumPy", "Beautifulsoup", "Playwright", "Selenium", "Keras", "OpenCV"], "☁️ Cloud & DevOps": ["AWS (EC2, S3, SageMaker)", "Microsoft Azure", "GCP", "CI/CD (Jenkins, GitLab CI)", "Docker & Kubernetes"], "📊 Data & BI": ["ETL & Data Warehousing", "Web Scraping", "Power Automate & Power Apps", "Power BI & Tableau"], "💻 Programming": ["Python", "SQL", "JavaScript"],}
-PROFESSIONAL_EXPERIENCE = {"Software Engineer at Merkle CXM (May 2022 - present)":["Engineered robust data pipelines for large-scale data ingestion.","Designed generative AI solutions using GPT/Gemini models to automate workflows, boosting team productivity by 30%.","Collaborated with R&D on GitHub Copilot to implement in the workflows, boosting team productivity and efficiency by 50%.","Mentored junior engineers, improving team-wide adoption of best practices in prompt engineering and model optimization.","Currently developing agentic AI systems using LangChain and LangGraph to reduce human interaction in complex workflows.",]}
-PROJECTS = { "E-commerce Product Data Extraction": {"description": "Developed Python-based web scraping pipelines to extract product details, reviews, and recommendations from e-commerce platforms, enabling data-driven insights for competitive analysis.", "tech": ["Python", "Beautifulsoup", "Playwright and Selenium", "Scrapy", "Pandas", "SQL"]}, "AI-Powered Customer Service Chatbot": {"description": "Built and deployed an AI-powered chatbot using GPT models and RAG to automate customer support, resolving over 60% of common inquiries and reducing response times by 75%.", "tech": ["Python", "LangChain", "OpenAI API", "Streamlit", "Docker"]}, "Automated Financial Reporting Workflow": {"description": "Created an automation workflow using Power Automate to streamline the generation of weekly financial reports, improving efficiency and reducing manual effort by 90%.", "tech": ["Power Automate", "SharePoint"]}, "Real-time Image Classification Model": {"description": "Developed and deployed an image classification model using CNNs in TensorFlow to classify product images from a live camera feed with an accuracy of 94%.", "tech": ["TensorFlow", "Keras", "OpenCV", "AWS SageMaker"]}}
-CERTIFICATIONS_DATA = [ {"image_path": os.path.join(CERTIFICATIONS_DIR, "aws_certified_machine_learning_specialty.png"), "title": "AWS Certified Machine Learning – Specialty", "description": "Validated expertise in building, training, tuning, and deploying machine learning models using AWS services."}, {"image_path": os.path.join(CERTIFICATIONS_DIR, "IBM Data Science.png"), "title": "IBM Data Science Professional Certificate", "description": "Acquired proficiency in Python programming, SQL, data analysis, visualization, machine learning, and deep learning through a series of courses."}, {"image_path": os.path.join(CERTIFICATIONS_DIR, "Azure_AI_Fundamentals.png"), "title": "Microsoft Certified: Azure AI Fundamentals", "description": "Acquired foundational knowledge of artificial intelligence (AI) and machine learning (ML) concepts, and how they're implemented using Microsoft Azure services."},]
-AWARDS_DATA = [ {"image_path": os.path.join(AWARDS_DIR, "RnR_Individual_Brilliance.jpg"), "title": "Individual Brilliance", "description": "Awarded for significant contributions in internal initiatives and client delivery."}, {"image_path": os.path.join(AWARDS_DIR, "Infinity_Award_Crawl_Build_AI_Re-engineering.JPG"), "title": "Crawl Build AI Re-engineering", "description": "Awarded for significant contributions to innovative AI solution development in 2023-24."}, {"image_path": os.path.join(AWARDS_DIR, "RnR_Meta_build_delivery_and_onboarding_team_Certificate.jpg"), "title": "Client Delivery and Onboarding", "description": "Awarded for significant contributions in team onboarding and client delivery in 2024"},]
-BADGES_DATA = [ {"image_path": os.path.join(BADGES_DIR, "Deeplearning.png"), "title": "Deep Learning"}, {"image_path": os.path.join(BADGES_DIR, "Applied_Data_Science_Capstone.png"), "title": "Applied Data Science Capstone"}, {"image_path": os.path.join(BADGES_DIR, "Accelerated Deep Learning with GPU.png"), "title": "Accelerated Deep Learning with GPU"},]
-EDUCATION = { "Institution": "M.H. Saboo Siddik College of Engineering, Mumbai", "Degree": "Bachelor of Engineering in Information Technology", "Graduation Year": "2022", "CGPA": "8.48 / 10.00"}
-SOFT_SKILLS = ["Leadership & Mentoring", "Effective Communication", "Agile & Scrum Methodologies", "Creative Problem-Solving", "Stakeholder Collaboration"]
-
-# --- CHATBOT KNOWLEDGE BASE & LOGIC ---
-@st.cache_data
-def get_knowledge_base():
-    kb_parts=[f"Name: Nizaal Khot\nRole: AI/ML Engineer | Data Scientist\n\n## Professional Summary\n{PROFESSIONAL_SUMMARY}\n", "## Technical Skills\n" + "\n".join([f"- {cat.split(' ')[-1]}: {', '.join(skills)}" for cat, skills in TECHNICAL_SKILLS.items()]),"\n## Professional Experience\n" + "\n".join([f"- **{title}**\n" + "\n".join([f"  - {p.split('<')[0]}" for p in points]) for title, points in PROFESSIONAL_EXPERIENCE.items()]),"\n## Projects\n" + "\n".join([f"- **{title}**: {details['description'].split('<')[0]} (Tech: {', '.join(details['tech'])})" for title, details in PROJECTS.items()]),f"\n## Education\n- {EDUCATION['Degree']} from {EDUCATION['Institution']} ({EDUCATION['Graduation Year']}, CGPA: {EDUCATION['CGPA']})\n","## Certifications\n" + "\n".join([f"- **{cert['title']}**: {cert['description']}" for cert in CERTIFICATIONS_DATA]),"\n## Awards\n" + "\n".join([f"- **{award['title']}**: {award['description']}" for award in AWARDS_DATA]),"\n## Soft Skills\n- " + ", ".join(SOFT_SKILLS)]
-    return "\n".join(kb_parts)
-
-def get_chatbot_response(query, chat_history):
-    if not GEMINI_MODEL: return "The chatbot is currently unavailable. Please check the API key configuration."
-    KNOWLEDGE_BASE=get_knowledge_base()
-    system_prompt=f"You are Nizaal Bot, a friendly AI assistant who will pretend to be Nizaal Khot. Answer questions ONLY based on the KNOWLEDGE BASE below. Be conversational and present your answers in clear format for the person to quickly understand. If the answer isn't in the knowledge base, say you don't have information on that topic. \n\nKNOWLEDGE BASE:\n{KNOWLEDGE_BASE}"
-    try:
-        chat=GEMINI_MODEL.start_chat(history=chat_history)
-        response=chat.send_message(system_prompt + "\n\nUser Question: " + query)
-        return response.text
-    except Exception as e:
-        return f"Sorry, an error occurred."
+    render_html(fragments.compiled("css", lambda css: f"<style>{fragments.minify_css(css)}</style>", PAGE_CSS))
+
+# --- PRECOMPILED STATIC SECTIONS ---
+# Built once per process and tenant by fragments.compiled() (named "<tenant>:<section>") and
+# rebuilt only when their source data changes.
+def get_media_source():
+    """What image tags depend on besides the data: the delivery mode and the content-hashed variant files."""
+    return MEDIA_MODE, MEDIA_URL, tenant.media_source(MEDIA_FORMATS)
+
+def build_header_html(profile_photo_path, social_links, _media):
+    profile_pic_html = get_image_html(profile_photo_path, "profile")
+    icons_html = "".join([f'<a href="{url}" target="_blank">{img}</a>' for _, path, url in social_links if (img := get_image_html(path, "icon", ' width="32"'))])
+    return {"profile": f'<div class="profile-img">{profile_pic_html}</div>' if profile_pic_html else None, "social": f"<div class='social-icons'>{icons_html}</div>"}
+
+def build_card_html(items, _media):
+    return [f'<div class="cert-award-item">{img_html}<p><b>{item["title"]}</b></p></div><br>' for item in items if (img_html := get_image_html(item["image_path"], "card", f' alt="{item["title"]}"'))]
+
+
+
+def transcript_markdown(message):
+    """An earlier message as one entry of the loaded transcript; its headings become bold text."""
+    speaker = "You" if message.role == "user" else tenant.bot_name
+    return f"**{speaker}:** " + re.sub(r"^#{1,6}\s+(.+)$", r"**\1**", message.content, flags=re.M)
+
+def render_transcript(memory, start, stop):
+    """Messages [start, stop) (absolute numbers, counting trimmed ones) as a single markdown element.
+
+    Each message's markdown is built once and kept in the session with the message it came
+    from, so loaded history isn't re-processed on later turns.
+    """
+    cache = st.session_state.setdefault("chat_transcript", {})
+    first = memory.trimmed
+    for number in [n for n in cache if not first <= n < first + len(memory.messages)]:
+        del cache[number]
+    parts = []
+    for number in range(start, stop):
+        message = memory.messages[number - first]
+        cached = cache.get(number)
+        if cached is None or cached[0] is not message:
+            cached = cache[number] = (message, transcript_markdown(message))
+        parts.append(cached[1])
+    st.markdown("\n\n---\n\n".join(parts))
+
+def load_earlier(start):
+    st.session_state.chat_loaded_from = start
+
+def record_cache_stats():
+    """Publishes the chatbot's shared cache and scheduler counters, and the fragment builds, as gauges."""
+    chatbot.record_cache_stats()
+    metrics.REGISTRY.set("portfolio_fragment_builds", fragments.builds)
 
 
 # --- MAIN APP LAYOUT ---
@@ -183,7 +149,7 @@ load_css()
 main_col, chat_col = st.columns([2, 1])
 
 # --- SIDEBAR (Optional Navigation) ---
-with st.sidebar:
+with metrics.span("section:sidebar"), st.sidebar:
     st.title("Quick Navigation")
     st.markdown("[Summary](#professional-summary)")
     st.markdown("[Skills](#technical-skills)")
@@ -197,115 +163,147 @@ with st.sidebar:
 # --- MAIN PORTFOLIO CONTENT ---
 with main_col:
     # Header Section
-    with st.container():
-        col1, col2 = st.columns([0.3, 0.7], gap="large")
-        with col1:
-            if profile_pic_b64 := get_image_as_base64(PROFILE_PHOTO_PATH):
-                st.markdown(f'<div class="profile-img"><img src="data:image/jpeg;base64,{profile_pic_b64}"></div>', unsafe_allow_html=True)
-        with col2:
-            st.title("Nizaal Khot")
-            st.subheader("AI/ML Engineer | Data Scientist")
-            st.write("Passionate about building intelligent systems that solve real-world problems.")
-            # Social Icons
-            icons = {
-                "LinkedIn": (get_image_as_base64(LINKEDIN_ICON_PATH), "https://linkedin.com/in/nizaalkhot"),
-                "GitHub": (get_image_as_base64(GITHUB_ICON_PATH), "https://github.com/nizaalkhot"),
-                "Email": (get_image_as_base64(GMAIL_ICON_PATH), "mailto:nijaal.khot.1@gmail.com"),
-            }
-            social_icons_html = "".join([f'<a href="{url}" target="_blank"><img src="data:image/png;base64,{b64}" width="32"></a>' for name, (b64, url) in icons.items() if b64])
-            st.markdown(f"<div class='social-icons'>{social_icons_html}</div>", unsafe_allow_html=True)
-    
+    with metrics.span("section:header"):
+        with st.container():
+            col1, col2 = st.columns([0.3, 0.7], gap="large")
+            header_html = fragments.compiled(f"{tenant.name}:header", build_header_html, profile["profile_photo_path"], profile["social_links"], get_media_source())
+            with col1:
+                if header_html["profile"]:
+                    render_html(header_html["profile"])
+            with col2:
+                st.title(profile["name"])
+                st.subheader(profile["role"])
+                st.write(profile["tagline"])
+                render_html(header_html["social"])
+
     st.divider()
 
     # Professional Summary
-    st.markdown("<h2 id='professional-summary'>👨‍💻 Professional Summary</h2>", unsafe_allow_html=True)
-    st.write(PROFESSIONAL_SUMMARY)
+    with metrics.span("section:summary"):
+        render_html("<h2 id='professional-summary'>👨‍💻 Professional Summary</h2>")
+        st.write(profile["professional_summary"])
     st.divider()
 
     # Technical Skills
-    st.markdown("<h2 id='technical-skills'>🛠️ Technical Skills</h2>", unsafe_allow_html=True)
-    skill_tabs = st.tabs(list(TECHNICAL_SKILLS.keys()))
-    for tab, (category, skills) in zip(skill_tabs, TECHNICAL_SKILLS.items()):
-        with tab:
-            st.markdown(''.join([f'<span class="skill-tag">{skill}</span>' for skill in skills]), unsafe_allow_html=True)
+    with metrics.span("section:skills"):
+        render_html("<h2 id='technical-skills'>🛠️ Technical Skills</h2>")
+        skill_tags_html = fragments.compiled(f"{tenant.name}:skills", lambda skills: {category: fragments.tags(items) for category, items in skills.items()}, profile["technical_skills"])
+        skill_tabs = st.tabs(list(profile["technical_skills"].keys()))
+        for tab, category in zip(skill_tabs, profile["technical_skills"]):
+            with tab:
+                render_html(skill_tags_html[category])
     st.divider()
 
     # Professional Experience
-    st.markdown("<h2 id='professional-experience'>💼 Professional Experience</h2>", unsafe_allow_html=True)
-    for title, details in PROFESSIONAL_EXPERIENCE.items():
-        with st.expander(f"**{title}**", expanded=True):
-            for point in details:
-                st.markdown(f"- {point}", unsafe_allow_html=True)
+    with metrics.span("section:experience"):
+        render_html("<h2 id='professional-experience'>💼 Professional Experience</h2>")
+        for title, details in profile["professional_experience"].items():
+            with st.expander(f"**{title}**", expanded=True):
+                for point in details:
+                    render_html(f"- {point}")
     st.divider()
 
     # Projects Handled
-    st.markdown("<h2 id='projects-handled'>🚀 Projects Handled</h2>", unsafe_allow_html=True)
-    for title, details in PROJECTS.items():
-        with st.expander(f"**{title}**"):
-            st.markdown(details['description'], unsafe_allow_html=True)
-            st.markdown(f"**Technologies:** {''.join([f'<span class=skill-tag>{t}</span>' for t in details['tech']])}", unsafe_allow_html=True)
+    with metrics.span("section:projects"):
+        render_html("<h2 id='projects-handled'>🚀 Projects Handled</h2>")
+        tech_html = fragments.compiled(f"{tenant.name}:projects", lambda projects: {title: f"**Technologies:** {fragments.tags(details['tech'])}" for title, details in projects.items()}, profile["projects"])
+        for title, details in profile["projects"].items():
+            with st.expander(f"**{title}**"):
+                render_html(details['description'])
+                render_html(tech_html[title])
     st.divider()
 
     # Certifications & Awards
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("<h2 id='certifications'>📜 Certifications</h2>", unsafe_allow_html=True)
-        for cert in CERTIFICATIONS_DATA:
-            if img_b64 := get_image_as_base64(cert["image_path"]):
-                st.markdown(f'<div class="cert-award-item"><img src="data:image/png;base64,{img_b64}" alt="{cert["title"]}"><p><b>{cert["title"]}</b></p></div><br>', unsafe_allow_html=True)
-    with col2:
-        st.markdown("<h2 id='awards'>🏆 Badges</h2>", unsafe_allow_html=True)
-        for award in BADGES_DATA:
-            if img_b64 := get_image_as_base64(award["image_path"]):
-                st.markdown(f'<div class="cert-award-item"><img src="data:image/png;base64,{img_b64}" alt="{award["title"]}"><p><b>{award["title"]}</b></p></div><br>', unsafe_allow_html=True)
+    with metrics.span("section:certifications"):
+        col1, col2 = st.columns(2)
+        with col1:
+            render_html("<h2 id='certifications'>📜 Certifications</h2>")
+            for card_html in fragments.compiled(f"{tenant.name}:certifications", build_card_html, profile["certifications_data"], get_media_source()):
+                render_html(card_html)
+        with col2:
+            render_html("<h2 id='awards'>🏆 Badges</h2>")
+            for card_html in fragments.compiled(f"{tenant.name}:badges", build_card_html, profile["badges_data"], get_media_source()):
+                render_html(card_html)
     st.divider()
 
     # Education & Soft Skills
-    st.markdown("<h2 id='education'>🎓 Education</h2>", unsafe_allow_html=True)
-    st.write(f"**{EDUCATION['Degree']}** | {EDUCATION['Institution']} ({EDUCATION['Graduation Year']}) | CGPA: {EDUCATION['CGPA']}")
-    st.markdown("---")
-    st.markdown("<h2>🤝 Soft Skills</h2>", unsafe_allow_html=True)
-    st.markdown(''.join([f'<span class="skill-tag">{skill}</span>' for skill in SOFT_SKILLS]), unsafe_allow_html=True)
+    with metrics.span("section:education"):
+        render_html("<h2 id='education'>🎓 Education</h2>")
+        education = profile["education"]
+        st.write(f"**{education['Degree']}** | {education['Institution']} ({education['Graduation Year']}) | CGPA: {education['CGPA']}")
+        st.markdown("---")
+        render_html("<h2>🤝 Soft Skills</h2>")
+        render_html(fragments.compiled(f"{tenant.name}:soft_skills", fragments.tags, profile["soft_skills"]))
 
 
 # --- FIXED CHATBOT COLUMN ---
-with chat_col:
-    st.markdown('<div class="sticky-chat-container">', unsafe_allow_html=True)
-    st.subheader("Chat with Nizaal Bot 💬")
+@metrics.run("chat")
+def chat_panel():
+    """Renders the chat column. Runs as a fragment, so a chat turn re-executes only this function."""
+    cpu_start = time.thread_time()
+    render_html('<div class="sticky-chat-container">')
+    st.subheader(f"Chat with {tenant.bot_name} 💬")
     st.write("Ask me anything about me!")
+    if chatbot.chat_degraded():
+        st.caption("⚠️ The AI model isn't responding right now; answers come from a backup model or straight from the profile.")
 
-    # Initialize chat state
-    if "messages" not in st.session_state:
-        st.session_state.messages = [{"role": "assistant", "content": "Hi there! I am Nizaal. How can I help you?"}]
-    if "chat_history_gemini" not in st.session_state:
-        st.session_state.chat_history_gemini = []
+    # The conversation itself lives in the process-wide store; the session only keeps its id (one per tenant)
+    conversation_id = st.session_state.setdefault("conversation_ids", {}).setdefault(tenant.name, uuid.uuid4().hex)
+    store = chatbot.get_conversation_store()
+    new_conversation = lambda: ConversationMemory(greeting=profile["chat_greeting"])
+    memory = store.get(conversation_id, factory=new_conversation)
 
-    # Display chat messages
+    # Display chat messages: the newest CHAT_WINDOW as bubbles, earlier ones only once loaded.
+    # Messages are numbered from the start of the conversation, counting trimmed ones.
+    first = memory.trimmed
+    live_from = first + max(0, len(memory.messages) - CHAT_WINDOW)
+    loaded_from = min(max(st.session_state.get("chat_loaded_from", live_from), first), live_from)
     chat_log_container = st.container()
     with chat_log_container:
-        st.markdown('<div class="chat-log">', unsafe_allow_html=True)
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-        st.markdown('</div>', unsafe_allow_html=True)
+        render_html('<div class="chat-log">')
+        if loaded_from > first:
+            st.button(f"Load earlier messages ({loaded_from - first})", key="load_earlier",
+                      on_click=load_earlier, args=(max(first, loaded_from - CHAT_WINDOW),))
+        elif memory.trimmed:
+            st.caption(f"{memory.trimmed} earlier messages are no longer shown.")
+        if loaded_from < live_from:
+            render_transcript(memory, loaded_from, live_from)
+        for message in memory.messages[live_from - first:]:
+            with st.chat_message(message.role):
+                st.markdown(message.content)
+        render_html('</div>')
 
     # Chat input
     if prompt := st.chat_input("Ask a question..."):
-        # Add user message to state and display it
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
-        # Get and display assistant response
-        with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = get_chatbot_response(prompt, chat_history=st.session_state.chat_history_gemini)
-                st.markdown(response)
-        
-        # Add assistant response to state
-        st.session_state.messages.append({"role": "assistant", "content": response})
-        
-        # Update Gemini's history
-        st.session_state.chat_history_gemini.append({"role": "user", "parts": [prompt]})
-        st.session_state.chat_history_gemini.append({"role": "model", "parts": [response]})
-        st.rerun()
-
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+        # Display the user message at the end of the log, above the input
+        with chat_log_container:
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+            # Stream the assistant response into its bubble as it is generated
+            with st.chat_message("assistant"):
+                queue_status = st.empty()
+                response = st.write_stream(stream_chatbot_response(
+                    prompt, memory,
+                    on_wait=lambda position: queue_status.caption(f"Lots of visitors right now: you're #{position} in the queue...") if position else queue_status.empty(),
+                    tenant=tenant, conversation_id=conversation_id,
+                ))
+                queue_status.empty()
+
+        # Record the turn (older turns get folded into the running summary sent to Gemini). Nothing
+        # came back if a newer message from this visitor cancelled the request.
+        if response:
+            store.add_turn(conversation_id, prompt, response, factory=new_conversation)
+        if not CHAT_FRAGMENT:
+            st.rerun()
+        logger.info("chat turn: %.1f ms CPU", (time.thread_time() - cpu_start) * 1000)
+        record_cache_stats()
+
+    render_html('</div>')
+
+with chat_col:
+    st.fragment(chat_panel)() if CHAT_FRAGMENT else chat_panel()
+
+record_cache_stats()
+metrics.finish_run()
+chatbot.preload_chat_model()
@@ -0,0 +1,41 @@
+"""Measures server CPU per chat turn, with the chat fragment on and off.
+
+Starts `streamlit run main.py` once per mode, drives it over the websocket the
+browser uses, and reads the server's CPU time from /proc (Linux only). Without a
+GOOGLE_API_KEY the bot answers instantly, so the numbers are the page's own cost.
+
+    python measure_chat_cpu.py [--turns 20] [--port 8765]
+"""
+import argparse
+import asyncio
+
+from st_client import Session, server_cpu_seconds, start_server
+
+
+async def measure(port, pid, turns):
+    session = await Session.connect(port)
+    try:
+        await session.rerun()
+        cpu_start, bytes_total = server_cpu_seconds(pid), 0
+        for turn in range(turns):
+            _, received_bytes = await session.chat(f"What are your skills? ({turn})")
+            bytes_total += received_bytes
+        return (server_cpu_seconds(pid) - cpu_start) / turns, bytes_total / turns
+    finally:
+        await session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for label, fragment in (("full page rerun (before)", "0"), ("chat fragment (after)", "1")):
+        server = start_server(args.port, env={"PORTFOLIO_CHAT_FRAGMENT": fragment})
+        try:
+            cpu, sent = asyncio.run(measure(args.port, server.pid, args.turns))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{label:26} {cpu * 1000:7.1f} ms server CPU/turn  {sent / 1024:8.1f} KB sent/turn")
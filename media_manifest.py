@@ -0,0 +1,160 @@
+"""Media manifest: every image a profile references, checked and measured once.
+
+Built when a tenant loads (tenants.Tenant.manifest) and by this script at deploy
+time. It records each image's size, pixel dimensions (with Pillow) and content
+hash, and checks the profile's entries for the fields its page and knowledge base
+use. The page looks images up here instead of stat-ing files on every run.
+
+    python media_manifest.py                  # the default profile
+    python media_manifest.py --profile jane-doe [--json manifest.json] [--strict]
+    python media_manifest.py --all            # the default profile and every tenant
+
+Exits 1 if there are errors: an image the page shows that is missing or unreadable,
+or an incomplete entry. --strict also fails on warnings (oversized images, missing
+images only the knowledge base refers to).
+"""
+import argparse
+import json
+import os
+import sys
+
+import assets
+from profile_data import DEFAULT_PROFILE, IMAGE_LISTS, media_variants
+
+# Originals past these are worth shrinking: without Pillow they are sent as they are.
+MAX_IMAGE_BYTES = int(float(os.environ.get("PORTFOLIO_MAX_IMAGE_KB", 1024)) * 1024)
+MAX_IMAGE_SIDE = int(os.environ.get("PORTFOLIO_MAX_IMAGE_SIDE", 4096))
+REQUIRED_FIELDS = ("name", "role", "professional_summary")
+EDUCATION_FIELDS = ("Degree", "Institution", "Graduation Year", "CGPA")
+
+
+class Manifest:
+    """The images of one profile that exist, by path, and the problems found checking it."""
+
+    def __init__(self, files, problems):
+        self.files = files  # path -> {"bytes", "width", "height", "hash", "mime"}
+        self.problems = problems  # [(level, message)], level "error" or "warning"
+
+    def __contains__(self, path):
+        return path in self.files
+
+    @property
+    def errors(self):
+        return [message for level, message in self.problems if level == "error"]
+
+    @property
+    def warnings(self):
+        return [message for level, message in self.problems if level == "warning"]
+
+    def to_dict(self):
+        return {"files": self.files, "errors": self.errors, "warnings": self.warnings}
+
+
+def image_refs(profile):
+    """Every (where, path) image reference in a profile, in page order."""
+    return ([("profile_photo_path", profile.get("profile_photo_path"))]
+            + [(f"social_links[{label}]", icon) for label, icon, _ in profile.get("social_links", [])]
+            + [(f"{key}[{i}]", item.get("image_path")) for key in IMAGE_LISTS for i, item in enumerate(profile.get(key, []))])
+
+
+def inspect(path):
+    """Size, dimensions and hash of one image; raises OSError if it can't be read."""
+    size = os.path.getsize(path)
+    width = height = None
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError:
+        pass
+    else:
+        try:
+            with Image.open(path) as img:  # reads the header only
+                width, height = img.size
+        except UnidentifiedImageError as e:
+            raise OSError(f"not an image: {e}") from e
+    return {"bytes": size, "width": width, "height": height, "hash": assets.content_hash(path), "mime": assets.mime_type(path)}
+
+
+def check_entries(profile):
+    """Problems with the profile's text entries."""
+    problems = [("error", f"{field}: missing") for field in REQUIRED_FIELDS if not profile.get(field)]
+    for title, details in profile.get("projects", {}).items():
+        if not details.get("description"):
+            problems.append(("error", f"projects[{title}]: no description"))
+        if not isinstance(details.get("tech"), list):
+            problems.append(("error", f"projects[{title}]: 'tech' must be a list"))
+    for key in IMAGE_LISTS:
+        for i, item in enumerate(profile.get(key, [])):
+            if not item.get("title"):
+                problems.append(("error", f"{key}[{i}]: no title"))
+            elif key != "badges_data" and not item.get("description"):
+                problems.append(("warning", f"{key}[{i}] {item['title']!r}: no description for the knowledge base"))
+    for label, _, url in profile.get("social_links", []):
+        if not url:
+            problems.append(("error", f"social_links[{label}]: no URL"))
+    education = profile.get("education", {})
+    if any(education.get(field) for field in EDUCATION_FIELDS):
+        problems += [("warning", f"education: no {field}") for field in EDUCATION_FIELDS if not education.get(field)]
+    return problems
+
+
+def build(profile, max_bytes=MAX_IMAGE_BYTES, max_side=MAX_IMAGE_SIDE):
+    """Checks a profile and every image it references, reading each file once."""
+    shown = {path for path, _ in media_variants(profile)}
+    files, problems = {}, check_entries(profile)
+    for where, path in image_refs(profile):
+        level = "error" if path in shown else "warning"
+        if not path:
+            problems.append((level, f"{where}: no image (unset, or outside the profile's directory)"))
+            continue
+        if path not in files:
+            try:
+                files[path] = inspect(path)
+            except OSError as e:
+                problems.append((level, f"{where}: {path}: {e.strerror or e}"))
+                continue
+        entry = files[path]
+        if entry["bytes"] > max_bytes:
+            problems.append(("warning", f"{where}: {path} is {entry['bytes'] / 1024:.0f} KB (limit {max_bytes / 1024:.0f} KB)"))
+        if max(entry["width"] or 0, entry["height"] or 0) > max_side:
+            problems.append(("warning", f"{where}: {path} is {entry['width']}x{entry['height']} px (limit {max_side} px)"))
+    return Manifest(files, problems)
+
+
+def print_report(name, manifest):
+    print(f"== {name}")
+    for path, entry in manifest.files.items():
+        dimensions = f"{entry['width']}x{entry['height']}" if entry["width"] else "?"
+        print(f"  {entry['bytes'] / 1024:8.1f} KB  {dimensions:>11}  {entry['hash']}  {path}")
+    for level, message in manifest.problems:
+        print(f"  {level}: {message}")
+
+
+if __name__ == "__main__":
+    import tenants
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", metavar="NAME", help="check this tenant instead of the default profile")
+    parser.add_argument("--all", action="store_true", help="check the default profile and every tenant")
+    parser.add_argument("--dir", default=tenants.TENANTS_DIR, help="tenants directory")
+    parser.add_argument("--json", metavar="PATH", help="also write the manifest(s) as JSON")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args()
+
+    names = [args.profile or tenants.DEFAULT_TENANT]
+    if args.all:
+        names = [tenants.DEFAULT_TENANT] + (sorted(os.listdir(args.dir)) if os.path.isdir(args.dir) else [])
+    manifests, failed = {}, False
+    for name in names:
+        try:
+            profile = DEFAULT_PROFILE if name == tenants.DEFAULT_TENANT else tenants.load_profile(tenants.profile_path(name, args.dir))
+        except (OSError, ValueError) as e:
+            print(f"== {name}\n  error: {e}")
+            failed = True
+            continue
+        manifests[name] = manifest = build(profile)
+        print_report(name, manifest)
+        failed = failed or bool(manifest.errors or (args.strict and manifest.warnings))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({name: manifest.to_dict() for name, manifest in manifests.items()}, f, indent=2)
+    sys.exit(1 if failed else 0)
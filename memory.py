@@ -0,0 +1,112 @@
+"""Token-budgeted conversation memory: recent turns verbatim, older turns folded into a running summary."""
+import re
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting without an API call."""
+    return len(text) // 4 + 1
+
+
+def summarise_turn(user, model, max_chars=160):
+    """Folds one question/answer pair into a single summary line: the question and the answer's first sentence."""
+    answer = re.split(r"(?<=[.!?])\s", " ".join(model.split()), maxsplit=1)[0]
+    question = " ".join(user.split())
+    return f"- Visitor asked: {question[:max_chars]} | Answer: {answer[:max_chars]}"
+
+
+# Approximate per-message cost beyond its text: the slotted object, its str headers and the list slot.
+MESSAGE_OVERHEAD = 160
+
+
+class Message:
+    """One chat message. Slotted, since a busy process holds many thousands of them."""
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+    def nbytes(self):
+        return len(self.content.encode()) + MESSAGE_OVERHEAD
+
+
+class ConversationMemory:
+    """The one canonical copy of a chat: every message shown to the visitor, and the model's view of it.
+
+    The model sees the last `keep_turns` turns verbatim within `token_budget`; older turns are
+    folded into a summary capped at `summary_budget` tokens (oldest lines dropped first), so the
+    history sent with each message stays roughly constant in size however long the chat runs.
+    Folded turns stay in `messages` for display until the conversation exceeds `max_messages`
+    or `max_bytes`, when the oldest are dropped (`trimmed` counts them).
+    """
+
+    __slots__ = ("keep_turns", "token_budget", "summary_budget", "max_messages", "max_bytes",
+                 "messages", "summary_lines", "trimmed", "nbytes", "last_active", "_start")
+
+    def __init__(self, keep_turns=3, token_budget=1200, summary_budget=250, max_messages=200, max_bytes=256 * 1024, greeting=None):
+        self.keep_turns = keep_turns
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_messages = max(max_messages, 2 * keep_turns + 1)
+        self.max_bytes = max_bytes
+        self.messages = [Message("assistant", greeting)] if greeting else []
+        self._start = len(self.messages)  # first message still verbatim in the model's history
+        self.summary_lines = []
+        self.trimmed = 0
+        self.nbytes = sum(message.nbytes() for message in self.messages)
+        self.last_active = 0.0
+
+    @property
+    def turns(self):
+        """(user, model) pairs still sent verbatim, derived from `messages`."""
+        recent = self.messages[self._start:]
+        return [(recent[i].content, recent[i + 1].content) for i in range(0, len(recent) - 1, 2)]
+
+    def add_turn(self, user, model):
+        for message in (Message("user", user), Message("assistant", model)):
+            self.messages.append(message)
+            self.nbytes += message.nbytes()
+        while self._start < len(self.messages) and (len(self.turns) > self.keep_turns or self.tokens() > self.token_budget):
+            self.summary_lines.append(summarise_turn(self.messages[self._start].content, self.messages[self._start + 1].content))
+            self._start += 2
+        while self.summary_lines and estimate_tokens(self.summary) > self.summary_budget:
+            self.summary_lines.pop(0)
+        # Only messages the model no longer sees verbatim are dropped from the display log.
+        while self._start and (len(self.messages) > self.max_messages or self.nbytes > self.max_bytes):
+            self.nbytes -= self.messages.pop(0).nbytes()
+            self._start -= 1
+            self.trimmed += 1
+
+    @property
+    def summary(self):
+        return "\n".join(self.summary_lines)
+
+    def size(self):
+        """Approximate bytes held: the messages plus the summary."""
+        return self.nbytes + sum(len(line) for line in self.summary_lines)
+
+    def tokens(self):
+        """Estimated tokens of the verbatim turns plus the summary."""
+        return sum(estimate_tokens(user) + estimate_tokens(model) for user, model in self.turns) + estimate_tokens(self.summary)
+
+    def last_question(self):
+        return self.messages[-2].content if len(self.messages) - self._start >= 2 else ""
+
+    def history(self):
+        """The verbatim turns in the role/parts format the Gemini API expects."""
+        return [{"role": "user" if message.role == "user" else "model", "parts": [message.content]} for message in self.messages[self._start:]]
+
+    def to_dict(self):
+        return {"messages": [[message.role, message.content] for message in self.messages], "start": self._start,
+                "summary_lines": self.summary_lines, "trimmed": self.trimmed}
+
+    @classmethod
+    def from_dict(cls, data, **options):
+        memory = cls(**options)
+        memory.messages = [Message(role, content) for role, content in data["messages"]]
+        memory._start = data["start"]
+        memory.summary_lines = list(data["summary_lines"])
+        memory.trimmed = data["trimmed"]
+        memory.nbytes = sum(message.nbytes() for message in memory.messages)
+        return memory
@@ -0,0 +1,170 @@
+"""Per-run performance instrumentation: timing spans, counters and histograms.
+
+Each script run (or chat-fragment run) is a Run holding the spans timed during it.
+Finished runs are appended to a JSONL log, and the process-wide counters and
+histograms can be rendered in the Prometheus text format:
+
+    PORTFOLIO_METRICS_LOG=metrics.jsonl   one JSON record per run
+    PORTFOLIO_METRICS_FILE=metrics.prom   Prometheus text, rewritten at most every few seconds
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+METRICS_LOG = os.environ.get("PORTFOLIO_METRICS_LOG")
+METRICS_FILE = os.environ.get("PORTFOLIO_METRICS_FILE")
+METRICS_FILE_INTERVAL = 5.0
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+
+class Registry:
+    """Thread-safe counters, gauges and histograms shared by every session in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}  # (name, labels) -> [bucket_counts, sum, count, buckets]
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            key = (name, _labels(labels))
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _labels(labels))] = value
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        with self._lock:
+            hist = self.histograms.setdefault((name, _labels(labels)), [[0] * (len(buckets) + 1), 0.0, 0, buckets])
+            hist[0][bisect_left(buckets, value)] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    def render_prometheus(self):
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines += [f"{name}{_format_labels(labels)} {value}" for (n, labels), value in sorted(metrics.items()) if n == name]
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), (counts, total, count, buckets) in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+_local = threading.local()
+_write_lock = threading.Lock()
+_last_file_write = 0.0
+
+
+class Run:
+    """One script or fragment run: its spans plus any fields recorded along the way (bytes, tokens...)."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.spans = []
+        self.fields = {}
+
+    def add(self, field, value):
+        self.fields[field] = self.fields.get(field, 0) + value
+
+    def finish(self):
+        duration = time.perf_counter() - self.started
+        REGISTRY.observe("portfolio_run_seconds", duration, kind=self.kind)
+        if "html_bytes" in self.fields:
+            REGISTRY.observe("portfolio_html_bytes", self.fields["html_bytes"], buckets=BYTES_BUCKETS, kind=self.kind)
+        record = {"ts": time.time(), "kind": self.kind, "duration_ms": round(duration * 1000, 3), "spans": self.spans, **self.fields}
+        export(record)
+        return record
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def start_run(kind):
+    """Starts recording a run on this thread, replacing any run left unfinished (e.g. by st.rerun)."""
+    _local.run = Run(kind)
+    return _local.run
+
+
+def finish_run():
+    run, _local.run = current_run(), None
+    return run.finish() if run else None
+
+
+@contextmanager
+def run(kind):
+    """Records the enclosed code as a run, or joins the run already in progress on this thread.
+
+    Usable as a decorator, e.g. on a fragment that runs both inside full page runs and on its own.
+    """
+    if current_run() is not None:
+        yield current_run()
+        return
+    started = start_run(kind)
+    try:
+        yield started
+    finally:
+        finish_run()
+
+
+@contextmanager
+def span(name, **detail):
+    """Times the enclosed code into the current run and the portfolio_span_seconds histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        REGISTRY.observe("portfolio_span_seconds", duration, span=name)
+        if (active := current_run()) is not None:
+            active.spans.append({"name": name, "ms": round(duration * 1000, 3), **detail})
+
+
+def record(field, value):
+    """Adds `value` to a field of the current run (no-op outside a run)."""
+    if (active := current_run()) is not None:
+        active.add(field, value)
+
+
+def export(record):
+    """Appends a run record to the JSONL log and refreshes the Prometheus file, when configured."""
+    global _last_file_write
+    with _write_lock:
+        if METRICS_LOG:
+            with open(METRICS_LOG, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        if METRICS_FILE and time.monotonic() - _last_file_write >= METRICS_FILE_INTERVAL:
+            _last_file_write = time.monotonic()
+            with open(METRICS_FILE + ".tmp", "w") as f:
+                f.write(REGISTRY.render_prometheus())
+            os.replace(METRICS_FILE + ".tmp", METRICS_FILE)
@@ -0,0 +1,130 @@
+"""Pluggable chat-model backends: Gemini, or a local fake for load tests and offline development.
+
+Every backend has `stream(history, message, usage, abort=None)`, which yields the
+reply's text chunks and fills `usage` with prompt/response token counts; `abort`
+(scheduler.Abort) stops a call the scheduler has cancelled. The backend is picked
+with PORTFOLIO_CHAT_BACKEND:
+
+    gemini                                   (default) pooled REST client (gemini_client.py), needs GOOGLE_API_KEY
+    gemini:pool_size=8,probe_interval=60,warmup=1
+    gemini-sdk                               google.generativeai, needs GOOGLE_API_KEY
+    fake                                     local stub, no network
+    fake:latency=0.8,chunk_delay=0.03,error_rate=0.05,rate_limit_rate=0.1
+"""
+import random
+import threading
+
+from memory import estimate_tokens
+
+
+class GeminiSDKBackend:
+    def __init__(self, api_key, model_name="gemini-1.5-flash", system_instruction=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+    def stream(self, history, message, usage, abort=None):
+        # The SDK gives no handle to stop a call; a cancelled one ends at the scheduler's next chunk.
+        chat = self.model.start_chat(history=history)
+        for chunk in chat.send_message(message, stream=True):
+            # Usage metadata is cumulative, so the last chunk's counts cover the whole reply.
+            if meta := getattr(chunk, "usage_metadata", None):
+                usage.update(prompt=meta.prompt_token_count, response=meta.candidates_token_count)
+            if chunk.parts:
+                yield chunk.text
+
+
+class FakeAPIError(Exception):
+    """Stands in for google.api_core errors; `code` is the HTTP status the scheduler retries on."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeBackend:
+    """Answers locally after a configurable delay, streaming word by word, with optional error injection.
+
+    latency:             seconds before the first chunk (jittered +/-50%)
+    chunk_delay:         seconds between chunks
+    reply_words:         length of each reply
+    error_rate:          chance a call fails with a 500 before streaming
+    rate_limit_rate:     chance a call fails with a 429 before streaming
+    midstream_error_rate: chance a call fails halfway through the reply
+    """
+
+    def __init__(self, latency=0.5, chunk_delay=0.02, reply_words=60, error_rate=0.0, rate_limit_rate=0.0,
+                 midstream_error_rate=0.0, seed=None):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.reply_words = int(reply_words)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.midstream_error_rate = midstream_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _roll(self, rate):
+        with self._lock:
+            return self._random.random() < rate
+
+    def stream(self, history, message, usage, abort=None):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._random.uniform(0.5, 1.5)
+        stopped = threading.Event()
+        if abort:
+            abort.on_abort(stopped.set)
+        if stopped.wait(delay):
+            return
+        if self._roll(self.rate_limit_rate):
+            raise FakeAPIError(429, "Resource has been exhausted (fake)")
+        if self._roll(self.error_rate):
+            raise FakeAPIError(500, "Internal error (fake)")
+
+        question = message.rsplit("User Question:", 1)[-1].strip()
+        words = f"(Simulated answer to: {question})".split() + ["lorem"] * max(0, self.reply_words - 5)
+        fail_at = len(words) // 2 if self._roll(self.midstream_error_rate) else None
+        for i, word in enumerate(words):
+            if i == fail_at:
+                raise FakeAPIError(503, "Stream interrupted (fake)")
+            if i and stopped.wait(self.chunk_delay):
+                return
+            yield word + " "
+        usage.update(prompt=sum(estimate_tokens(p) for turn in history for p in turn["parts"]) + estimate_tokens(message),
+                     response=len(words))
+
+
+def parse_spec(spec):
+    """Splits "fake:latency=0.5,error_rate=0.1" into ("fake", {"latency": 0.5, "error_rate": 0.1})."""
+    name, _, options = spec.partition(":")
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        kwargs[key.strip()] = float(value)
+    return name.strip(), kwargs
+
+
+def create_backend(spec, api_key=None, system_instruction=None, model_name=None, **overrides):
+    """Builds the backend named by `spec` (see the module docstring).
+
+    `model_name` picks the Gemini model (ignored by the fake backend); `overrides` replace options from the spec.
+    """
+    name, kwargs = parse_spec(spec or "gemini")
+    kwargs.update(overrides)
+    if model_name and name.startswith("gemini"):
+        kwargs["model_name"] = model_name
+    if name == "fake":
+        return FakeBackend(**kwargs)
+    if name == "gemini":
+        from gemini_client import GeminiClient
+
+        warm_up = bool(kwargs.pop("warmup", 0))
+        client = GeminiClient(api_key, system_instruction=system_instruction, **kwargs)
+        client.start(warm_up=warm_up)
+        return client
+    if name == "gemini-sdk":
+        return GeminiSDKBackend(api_key, system_instruction=system_instruction, **kwargs)
+    raise ValueError(f"Unknown chat backend {name!r}")
@@ -0,0 +1,52 @@
+"""The portfolio's content: media paths and the profile data every page and the chatbot are built from.
+
+Kept free of Streamlit so the static export (export_site.py) and the chat endpoint
+(chat_server.py) can import it without running the app.
+"""
+import os
+
+MEDIA_DIR = "media"
+PROFILE_PHOTO_PATH = os.path.join(MEDIA_DIR, "profile-photo.jpg")
+LINKEDIN_ICON_PATH = os.path.join(MEDIA_DIR, "linkedin.png")
+GMAIL_ICON_PATH = os.path.join(MEDIA_DIR, "gmail.png")
+GITHUB_ICON_PATH = os.path.join(MEDIA_DIR, "github.png")
+CERTIFICATIONS_DIR = os.path.join(MEDIA_DIR, "certifications")
+AWARDS_DIR = os.path.join(MEDIA_DIR, "awards")
+BADGES_DIR = os.path.join(MEDIA_DIR, "badges")
+
+# --- DATA ---
+CHAT_GREETING = "Hi there! I am Nizaal. How can I help you?"
+PROFESSIONAL_SUMMARY = """
+Results-oriented Agentic AI Developer and Generative AI Developer with 3+ years of experience in developing and deploying scalable Machine Learning, Deep Learning, and NLP solutions. My expertise spans the entire AI project lifecycle, from data collection to model deployment and optimization, with a strong focus on leveraging generative AI, NLP, and LLMs for impactful business intelligence, process automation, and predictive analytics. I have a proven track record of developing sophisticated agentic AI systems. Adept at collaborating with cross-functional teams to integrate AI solutions and enhance operational efficiency, I am passionate about driving innovation and delivering scalable, reliable solutions with a strong focus on quality and compliance.
+"""
+TECHNICAL_SKILLS = { "🤖 ML & AI": ["Agentic AI Development", "Generative AI & Prompt Engineering", "LLM Fine-tuning (GPT, Gemini)", "Model Development (Regression, Classification, Clustering)", "NLP (Sentiment Analysis, Topic Modeling)", "Statistical Analysis & Feature Engineering"], "🧠 Frameworks": ["LangChain", "LangGraph", "TensorFlow", "Scikit-learn", "PyTorch", "Pandas", "NumPy", "Beautifulsoup", "Playwright", "Selenium", "Keras", "OpenCV"], "☁️ Cloud & DevOps": ["AWS (EC2, S3, SageMaker)", "Microsoft Azure", "GCP", "CI/CD (Jenkins, GitLab CI)", "Docker & Kubernetes"], "📊 Data & BI": ["ETL & Data Warehousing", "Web Scraping", "Power Automate & Power Apps", "Power BI & Tableau"], "💻 Programming": ["Python", "SQL", "JavaScript"],}
+PROFESSIONAL_EXPERIENCE = {"Software Engineer at Merkle CXM (May 2022 - present)":["Engineered robust data pipelines for large-scale data ingestion.","Designed generative AI solutions using GPT/Gemini models to automate workflows, boosting team productivity by 30%.","Collaborated with R&D on GitHub Copilot to implement in the workflows, boosting team productivity and efficiency by 50%.","Mentored junior engineers, improving team-wide adoption of best practices in prompt engineering and model optimization.","Currently developing agentic AI systems using LangChain and LangGraph to reduce human interaction in complex workflows.",]}
+PROJECTS = { "E-commerce Product Data Extraction": {"description": "Developed Python-based web scraping pipelines to extract product details, reviews, and recommendations from e-commerce platforms, enabling data-driven insights for competitive analysis.", "tech": ["Python", "Beautifulsoup", "Playwright and Selenium", "Scrapy", "Pandas", "SQL"]}, "AI-Powered Customer Service Chatbot": {"description": "Built and deployed an AI-powered chatbot using GPT models and RAG to automate customer support, resolving over 60% of common inquiries and reducing response times by 75%.", "tech": ["Python", "LangChain", "OpenAI API", "Streamlit", "Docker"]}, "Automated Financial Reporting Workflow": {"description": "Created an automation workflow using Power Automate to streamline the generation of weekly financial reports, improving efficiency and reducing manual effort by 90%.", "tech": ["Power Automate", "SharePoint"]}, "Real-time Image Classification Model": {"description": "Developed and deployed an image classification model using CNNs in TensorFlow to classify product images from a live camera feed with an accuracy of 94%.", "tech": ["TensorFlow", "Keras", "OpenCV", "AWS SageMaker"]}}
+CERTIFICATIONS_DATA = [ {"image_path": os.path.join(CERTIFICATIONS_DIR, "aws_certified_machine_learning_specialty.png"), "title": "AWS Certified Machine Learning – Specialty", "description": "Validated expertise in building, training, tuning, and deploying machine learning models using AWS services."}, {"image_path": os.path.join(CERTIFICATIONS_DIR, "IBM Data Science.png"), "title": "IBM Data Science Professional Certificate", "description": "Acquired proficiency in Python programming, SQL, data analysis, visualization, machine learning, and deep learning through a series of courses."}, {"image_path": os.path.join(CERTIFICATIONS_DIR, "Azure_AI_Fundamentals.png"), "title": "Microsoft Certified: Azure AI Fundamentals", "description": "Acquired foundational knowledge of artificial intelligence (AI) and machine learning (ML) concepts, and how they're implemented using Microsoft Azure services."},]
+AWARDS_DATA = [ {"image_path": os.path.join(AWARDS_DIR, "RnR_Individual_Brilliance.jpg"), "title": "Individual Brilliance", "description": "Awarded for significant contributions in internal initiatives and client delivery."}, {"image_path": os.path.join(AWARDS_DIR, "Infinity_Award_Crawl_Build_AI_Re-engineering.JPG"), "title": "Crawl Build AI Re-engineering", "description": "Awarded for significant contributions to innovative AI solution development in 2023-24."}, {"image_path": os.path.join(AWARDS_DIR, "RnR_Meta_build_delivery_and_onboarding_team_Certificate.jpg"), "title": "Client Delivery and Onboarding", "description": "Awarded for significant contributions in team onboarding and client delivery in 2024"},]
+BADGES_DATA = [ {"image_path": os.path.join(BADGES_DIR, "Deeplearning.png"), "title": "Deep Learning"}, {"image_path": os.path.join(BADGES_DIR, "Applied_Data_Science_Capstone.png"), "title": "Applied Data Science Capstone"}, {"image_path": os.path.join(BADGES_DIR, "Accelerated Deep Learning with GPU.png"), "title": "Accelerated Deep Learning with GPU"},]
+EDUCATION = { "Institution": "M.H. Saboo Siddik College of Engineering, Mumbai", "Degree": "Bachelor of Engineering in Information Technology", "Graduation Year": "2022", "CGPA": "8.48 / 10.00"}
+SOFT_SKILLS = ["Leadership & Mentoring", "Effective Communication", "Agile & Scrum Methodologies", "Creative Problem-Solving", "Stakeholder Collaboration"]
+
+# The default tenant's profile: the data above keyed by the constants' lowercased names, plus the
+# header details. Tenant profile files (see tenants.py) are loaded into the same shape.
+DEFAULT_PROFILE = {
+    "name": "Nizaal Khot", "role": "AI/ML Engineer | Data Scientist",
+    "tagline": "Passionate about building intelligent systems that solve real-world problems.",
+    "chat_greeting": CHAT_GREETING, "profile_photo_path": PROFILE_PHOTO_PATH,
+    "social_links": [("LinkedIn", LINKEDIN_ICON_PATH, "https://linkedin.com/in/nizaalkhot"), ("GitHub", GITHUB_ICON_PATH, "https://github.com/nizaalkhot"), ("Email", GMAIL_ICON_PATH, "mailto:nijaal.khot.1@gmail.com")],
+    "professional_summary": PROFESSIONAL_SUMMARY, "technical_skills": TECHNICAL_SKILLS, "professional_experience": PROFESSIONAL_EXPERIENCE,
+    "projects": PROJECTS, "certifications_data": CERTIFICATIONS_DATA, "awards_data": AWARDS_DATA, "badges_data": BADGES_DATA,
+    "education": EDUCATION, "soft_skills": SOFT_SKILLS,
+}
+# Profile sections whose items carry an image_path.
+IMAGE_LISTS = ("certifications_data", "awards_data", "badges_data")
+
+
+def media_variants(profile):
+    """Every image a profile's page renders, with the size variant (see assets.VARIANTS) it is shown at.
+
+    Awards appear only in the knowledge base, so their images aren't built.
+    """
+    return ([(profile["profile_photo_path"], "profile")] + [(path, "icon") for _, path, _ in profile["social_links"]]
+            + [(item["image_path"], "card") for item in profile["certifications_data"] + profile["badges_data"]])
@@ -0,0 +1,83 @@
+"""Startup profile: where a fresh process spends its time before the first page is rendered.
+
+Runs a page once in a new interpreter under `python -X importtime`, then builds
+the chat model the way the first chat message would. Reports wall time for each
+phase and the slowest imports in each, by cumulative time:
+
+    streamlit   importing Streamlit and its test harness
+    page        the first script run, including every module the page imports
+    chat model  the deferred backend setup (SDK import, client construction)
+
+    python profile_startup.py [--script main.py] [--top 10] [--backend gemini]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PHASE_MARKER = "### phase "
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Runs in the profiled interpreter; phase markers go to stderr between the importtime lines.
+PROFILED = """
+import json, os, sys, time
+t0 = time.perf_counter()
+print("{marker}streamlit", file=sys.stderr, flush=True)
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+print("{marker}page", file=sys.stderr, flush=True)
+app = AppTest.from_file(os.path.abspath({script!r}), default_timeout=120)
+app.run()
+t2 = time.perf_counter()
+print("{marker}chat model", file=sys.stderr, flush=True)
+import chatbot
+chatbot.get_chat_model()
+t3 = time.perf_counter()
+print(json.dumps({{"streamlit": t1 - t0, "page": t2 - t1, "chat model": t3 - t2,
+                  "exception": [e.message for e in app.exception], "setup_error": repr(chatbot.CHAT_SETUP_ERROR)}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Groups `-X importtime` lines by phase: {phase: [(cumulative_us, module)]} for top-level imports only."""
+    phases, phase = {}, None
+    for line in stderr.splitlines():
+        if line.startswith(PHASE_MARKER):
+            phase = line[len(PHASE_MARKER):]
+            phases[phase] = []
+        elif phase and (match := IMPORT_LINE.match(line)) and match.group(3) == " ":
+            phases[phase].append((int(match.group(2)), match.group(4)))
+    return phases
+
+
+def profile(script, backend):
+    env = dict(os.environ, PORTFOLIO_CHAT_BACKEND=backend)
+    # A placeholder key lets the Gemini client be constructed; nothing is sent during profiling.
+    env.setdefault("GOOGLE_API_KEY", "profile-startup")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROFILED.format(marker=PHASE_MARKER, script=script)],
+                            env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def report(timings, phases, top):
+    for phase, imports in phases.items():
+        total_imports = sum(us for us, _ in imports)
+        print(f"{phase:11} {timings[phase] * 1000:8.1f} ms wall, {total_imports / 1000:8.1f} ms in {len(imports)} top-level imports")
+        for us, module in sorted(imports, reverse=True)[:top]:
+            print(f"    {us / 1000:8.1f} ms  {module}")
+    print(f"{'total':11} {sum(timings[p] for p in phases) * 1000:8.1f} ms")
+    if timings["exception"]:
+        print(f"page raised: {timings['exception']}")
+    if timings["setup_error"] != "None":
+        print(f"chat model setup failed: {timings['setup_error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="main.py")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed per phase")
+    parser.add_argument("--backend", default="gemini", help="PORTFOLIO_CHAT_BACKEND for the chat-model phase")
+    args = parser.parse_args()
+    report(*profile(args.script, args.backend), args.top)
@@ -0,0 +1,51 @@
+"""Lightweight lexical (BM25) index for picking the knowledge-base chunks relevant to a question."""
+import math
+import re
+from collections import Counter
+
+STOPWORDS = frozenset(
+    "a about all an and any are as at be by can could did do does for from had has have how i in is it "
+    "me my of on or please tell than that the their there this to was were what when where which who "
+    "why will with would you your".split()
+)
+
+
+def tokenize(text):
+    """Lowercases, drops stopwords and folds simple plurals ("skills" -> "skill")."""
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class LexicalIndex:
+    """BM25 ranking over a fixed list of text chunks, built once and queried per message."""
+
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        self.chunks = list(chunks)
+        self.k1, self.b = k1, b
+        self._term_counts = [Counter(tokenize(chunk)) for chunk in self.chunks]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self.chunks else 0
+        doc_freq = Counter(term for counts in self._term_counts for term in counts)
+        n = len(self.chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def score(self, query):
+        """Returns the BM25 score of every chunk for `query`."""
+        terms = [term for term in tokenize(query) if term in self._idf]
+        scores = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            scores.append(sum(self._idf[t] * counts[t] * (self.k1 + 1) / (counts[t] + norm) for t in terms if t in counts))
+        return scores
+
+    def search(self, query, k=5):
+        """Returns up to `k` matching chunks, best first by score but kept in their original order."""
+        scores = self.score(query)
+        ranked = sorted((i for i, s in enumerate(scores) if s > 0), key=lambda i: -scores[i])[:k]
+        return [self.chunks[i] for i in sorted(ranked)]
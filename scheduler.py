@@ -0,0 +1,286 @@
+"""Process-wide scheduler for outbound model calls.
+
+Every session's request goes through one RequestScheduler, which
+  * caps concurrent calls and calls started per minute (the API quota),
+  * serves calls in FIFO order and reports each waiter's queue position,
+  * coalesces identical requests already in flight into one call,
+  * retries rate-limit/transient failures with jittered exponential backoff, and
+  * cancels a call (queued or streaming) once every request waiting on it has gone,
+    freeing its slot at once and aborting it through its Abort hook.
+
+A call is any zero-argument callable returning an iterable of text chunks, so a
+local fake backend can stand in for Gemini:
+
+    scheduler = RequestScheduler(max_concurrency=2, requests_per_minute=60)
+    for chunk in scheduler.stream("key", lambda: iter(["Hello", " world"])):
+        print(chunk)
+"""
+import random
+import threading
+import time
+from collections import deque
+
+# HTTP status codes worth retrying: rate limited, server error, unavailable, deadline exceeded.
+RETRYABLE_CODES = frozenset({429, 500, 503, 504})
+
+
+def is_retryable(error):
+    """True for rate-limit/transient errors; google.api_core exceptions carry the HTTP status as `code`."""
+    return getattr(error, "code", None) in RETRYABLE_CODES
+
+
+class _Flight:
+    """One in-flight call and the chunks it has produced so far, shared by every waiter with the same key."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.waiters = 0
+        self.cancelled = False
+        self.running = False  # holds a concurrency slot
+        self.abort = None
+
+
+class Abort:
+    """Stops a running call from another thread, e.g. by closing its HTTP response while it waits for a chunk.
+
+    The call registers what stops it with `on_abort(action)`; the scheduler calls the Abort once no
+    request is waiting on the call. An action registered after that runs at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._action = None
+        self.aborted = False
+
+    def on_abort(self, action):
+        with self._lock:
+            if not self.aborted:
+                self._action = action
+                return
+        action()
+
+    def __call__(self):
+        with self._lock:
+            self.aborted, action = True, self._action
+        if action:
+            action()
+
+
+class Waiter:
+    """One request's place on a flight: reads its chunks and, when closed, gives up its share of the call.
+
+    For callers that watch several calls at once (see RequestScheduler.wait); `stream` wraps one for the simple case.
+    """
+
+    def __init__(self, scheduler, flight):
+        self.scheduler = scheduler
+        self.flight = flight
+        self.sent = 0
+        self.closed = False
+
+    def position(self):
+        """1-based place in the queue, or 0 once the call is running."""
+        with self.scheduler._cond:
+            return self.scheduler.position(self.flight)
+
+    def ready(self):
+        """Whether there are unread chunks or the call has finished."""
+        return self.sent < len(self.flight.chunks) or self.flight.done
+
+    def started(self):
+        return bool(self.flight.chunks)
+
+    def error(self):
+        return self.flight.error if self.flight.done else None
+
+    def chunks(self, on_wait=None, timeout=None, cancel=None, heartbeat=1.0):
+        """Yields the call's chunks as they arrive; raises the call's error once retries are exhausted.
+
+        `on_wait(position)` is called when the queue position changes, and at least every
+        `heartbeat` seconds while waiting (position 0 once running). Raises TimeoutError if no
+        chunk arrives for `timeout` seconds; stops quietly once the `cancel` event is set.
+        """
+        scheduler, flight = self.scheduler, self.flight
+        last_position, last_chunk = None, scheduler.clock()
+        while True:
+            with scheduler._cond:
+                while not self.ready() and not (cancel and cancel.is_set()):
+                    position = scheduler.position(flight)
+                    if on_wait and position != last_position:
+                        break
+                    waited = scheduler.clock() - last_chunk
+                    if timeout is not None and waited >= timeout:
+                        raise TimeoutError(f"no response for {waited:.1f}s")
+                    if not scheduler._cond.wait(timeout=min(heartbeat, timeout - waited) if timeout is not None else heartbeat) and on_wait:
+                        break
+                else:
+                    position = None
+                chunks = flight.chunks[self.sent:]
+                done, error = flight.done, flight.error
+            if cancel and cancel.is_set():
+                return
+            if position is not None:
+                last_position = position
+                on_wait(position)
+                continue
+            if chunks:
+                last_chunk = scheduler.clock()
+            for chunk in chunks:
+                yield chunk
+            self.sent += len(chunks)
+            if done and self.sent == len(flight.chunks):
+                if error:
+                    raise error
+                return
+
+    def close(self):
+        """Stops waiting; the call is cancelled if no other request is waiting on it.
+
+        A cancelled call gives up its slot straight away, without waiting for its thread to notice:
+        that thread may be blocked on the upstream until its read timeout.
+        """
+        flight = self.flight
+        with self.scheduler._cond:
+            if self.closed:
+                return
+            self.closed = True
+            flight.waiters -= 1
+            if flight.waiters or flight.done:
+                return
+            flight.cancelled = True
+            self.scheduler.cancelled += 1
+            self.scheduler._free_slot(flight)
+            self.scheduler._cond.notify_all()
+        if flight.abort:
+            flight.abort()
+
+
+class RequestScheduler:
+    def __init__(self, max_concurrency=4, requests_per_minute=60, max_retries=3, base_delay=1.0, max_delay=20.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.calls = self.coalesced = self.retries = self.cancelled = 0
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._active = 0
+        self._started = deque()
+        self._flights = {}
+
+    def submit(self, key, call, abort=None):
+        """Starts `call` under the scheduler's limits, or joins the identical call in flight, and returns a Waiter.
+
+        `abort` (an Abort the call registers with) is called if the call is cancelled while it runs.
+        """
+        with self._cond:
+            flight = self._flights.get(key)
+            if flight is None or flight.cancelled:
+                flight = self._flights[key] = _Flight()
+                flight.abort = abort
+                threading.Thread(target=self._run, args=(key, flight, call), daemon=True).start()
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+            return Waiter(self, flight)
+
+    def wait(self, waiters, timeout):
+        """Blocks until one of `waiters` is ready (has unread chunks or has finished), or `timeout` passes."""
+        with self._cond:
+            if not any(waiter.ready() for waiter in waiters):
+                self._cond.wait(timeout=max(timeout, 0))
+
+    def stream(self, key, call, on_wait=None):
+        """Yields the chunks of `call()`, run under the scheduler's limits.
+
+        Requests with the same `key` while one is in flight share its chunks instead of
+        calling again. `on_wait(position)` is called whenever the request's place in the
+        queue changes. Raises the call's error once retries are exhausted; closing the
+        generator early cancels the call unless another request shares it.
+        """
+        waiter = self.submit(key, call)
+        try:
+            yield from waiter.chunks(on_wait=on_wait, heartbeat=60.0)
+        finally:
+            waiter.close()
+
+    def position(self, flight):
+        """1-based place of a flight in the queue, or 0 if it is running (or not queued)."""
+        try:
+            return self._queue.index(flight) + 1
+        except ValueError:
+            return 0
+
+    def _acquire(self, flight):
+        """Waits in FIFO order for a free slot within the concurrency and per-minute limits; False if cancelled meanwhile."""
+        with self._cond:
+            self._queue.append(flight)
+            self._cond.notify_all()
+            while True:
+                if flight.cancelled:
+                    self._queue.remove(flight)
+                    self._cond.notify_all()
+                    return False
+                now = self.clock()
+                while self._started and now - self._started[0] >= 60:
+                    self._started.popleft()
+                rate_limited = len(self._started) >= self.requests_per_minute
+                if self._queue[0] is flight and self._active < self.max_concurrency and not rate_limited:
+                    self._queue.popleft()
+                    self._active += 1
+                    flight.running = True
+                    self._started.append(now)
+                    self.calls += 1
+                    self._cond.notify_all()
+                    return True
+                self._cond.wait(timeout=60 - (now - self._started[0]) if rate_limited else None)
+
+    def _free_slot(self, flight):
+        """Gives back the flight's concurrency slot, once; callers hold the lock."""
+        if flight.running:
+            flight.running = False
+            self._active -= 1
+
+    def _release(self, flight):
+        with self._cond:
+            self._free_slot(flight)
+            self._cond.notify_all()
+
+    def _run(self, key, flight, call):
+        attempt = 0
+        while self._acquire(flight):
+            chunks = None
+            try:
+                chunks = iter(call())
+                for chunk in chunks:
+                    with self._cond:
+                        flight.chunks.append(chunk)
+                        self._cond.notify_all()
+                    if flight.cancelled:
+                        break
+                break
+            except Exception as e:
+                # A call that already produced chunks can't be retried without repeating them.
+                if flight.chunks or attempt >= self.max_retries or not is_retryable(e) or flight.cancelled:
+                    flight.error = e
+                    break
+            finally:
+                # Closing the generator ends the call, e.g. releases the HTTP response mid-stream.
+                if hasattr(chunks, "close"):
+                    chunks.close()
+                self._release(flight)
+            attempt += 1
+            with self._cond:
+                self.retries += 1
+            self.sleep(min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0))
+        with self._cond:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            self._cond.notify_all()
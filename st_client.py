@@ -0,0 +1,97 @@
+"""Minimal headless Streamlit client: starts the app and drives it over the websocket a browser uses.
+
+Shared by measure_chat_cpu.py and loadtest.py. Server CPU and memory are read
+from /proc, so those numbers are Linux only.
+"""
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+FINISHED_EARLY_FOR_RERUN = 2
+
+
+def start_server(port, script="main.py", env=None):
+    """Runs `streamlit run <script>` headless with extra environment variables and waits until it is healthy."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script, "--server.headless", "true", "--server.port", str(port)],
+        env=dict(os.environ, **(env or {})), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(150):
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health")
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+def server_cpu_seconds(pid):
+    """User + system CPU time of a process, from /proc/<pid>/stat."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def server_rss_bytes(pid):
+    """Resident memory of a process, from /proc/<pid>/status."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+class Session:
+    """One visitor's websocket session."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.chat_input_id = None
+        self.chat_fragment_id = ""
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(await websockets.connect(f"ws://localhost:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None))
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, widget_states=None, fragment_id=""):
+        """Requests a script run and waits for it (and any st.rerun it triggers) to finish.
+
+        Returns (ForwardMsgs received, bytes received).
+        """
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        if widget_states is not None:
+            msg.rerun_script.widget_states.CopyFrom(widget_states)
+        await self.ws.send(msg.SerializeToString())
+
+        received, received_bytes = [], 0
+        while True:
+            data = await self.ws.recv()
+            received_bytes += len(data)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            received.append(fwd)
+            if fwd.WhichOneof("type") == "delta" and fwd.delta.new_element.WhichOneof("type") == "chat_input":
+                self.chat_input_id, self.chat_fragment_id = fwd.delta.new_element.chat_input.id, fwd.delta.fragment_id
+            if fwd.WhichOneof("type") == "script_finished" and fwd.script_finished != FINISHED_EARLY_FOR_RERUN:
+                return received, received_bytes
+
+    async def chat(self, text):
+        """Submits `text` through the chat input, like pressing Enter in the browser."""
+        msg = BackMsg()
+        state = msg.rerun_script.widget_states.widgets.add()
+        state.id = self.chat_input_id
+        state.chat_input_value.data = text
+        return await self.rerun(msg.rerun_script.widget_states, self.chat_fragment_id)
@@ -0,0 +1,137 @@
+"""Stylesheets: the portfolio's theme, shared by the Streamlit page and the static export."""
+
+# Injected into the Streamlit page by main.load_css(); also the base of the exported site's stylesheet.
+PAGE_CSS = """
+/* --- THEME-AWARE VARIABLES --- */
+:root {
+    --card-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    --card-hover-shadow: 0 8px 12px rgba(0,0,0,0.15);
+    --selected-tab-bg: #FF4B4B;
+    --selected-tab-color: white;
+    --tag-bg: #FF4B4B;
+    --tag-color: white;
+    --sidebar-width: 320px;
+}
+
+
+/* --- DARK THEME OVERRIDES --- */
+.stApp[theme="dark"] {
+    --bg-color: #0e1117;
+    --text-color: #fafafa;
+    --header-color: #fafafa;
+    --card-bg-color: #262730;
+    --card-shadow: 0 4px 6px rgba(0,0,0,0.4);
+    --card-hover-shadow: 0 8px 12px rgba(0,0,0,0.5);
+}
+
+/* --- General & Layout --- */
+.stApp {
+    background-color: var(--bg-color);
+    color: var(--text-color);
+}
+h1, h2, h3, h4, h5, h6 {
+    color: var(--header-color);
+}
+
+/* --- STICKY, FULL-HEIGHT CHAT COLUMN --- */
+.fixed-chat-container {
+    position: sticky;
+    top: 0; /* Stick to the top of the viewport */
+    height: 100vh; /* Full screen height */
+    overflow-y: auto; /* Allow scrolling ONLY within the chat column */
+    display: flex;
+    flex-direction: column;
+    background-color: var(--bg-color); /* Match app background */
+    padding: 1rem;
+}
+
+/* --- Profile & Socials --- */
+.profile-img img {
+    width: 200px;
+    height: 200px;
+    border-radius: 50%;
+    object-fit: cover;
+    border: 5px solid #FF4B4B;
+    box-shadow: 0 0 30px rgba(255, 75, 75, 0.6);
+}
+.social-icons a {
+    margin: 0 12px;
+    transition: transform 0.3s ease;
+    display: inline-block;
+}
+.social-icons a:hover {
+    transform: scale(1.25);
+}
+
+/* --- Tags & Expanders --- */
+.skill-tag {
+    display: inline-block; padding: 0.5em 1em; margin: 0.3em;
+    background-color: var(--tag-bg); color: var(--tag-color);
+    border-radius: 16px; font-size: 0.9em; font-weight: 500;
+}
+div[data-testid="stExpander"] > div:first-child {
+    padding: 1rem; border-radius: 0.5rem; background-color: var(--card-bg-color);
+    box-shadow: var(--card-shadow); transition: transform 0.2s, box-shadow 0.2s;
+    margin-bottom: 1rem;
+}
+div[data-testid="stExpander"] > div:first-child:hover {
+    transform: translateY(-5px); box-shadow: var(--card-hover-shadow);
+}
+div[data-testid="stExpander"] .streamlit-expanderContent {
+     background-color: var(--card-bg-color); border-radius: 0.5rem;
+     margin-top: -0.5rem; padding: 1.5rem;
+}
+
+/* --- Certs & Awards --- */
+.cert-award-item {
+    text-align: center; padding: 15px; border-radius: 10px;
+    background-color: var(--card-bg-color); box-shadow: var(--card-shadow);
+    transition: transform 0.2s, box-shadow 0.2s; height: 100%;
+}
+.cert-award-item:hover {
+    transform: translateY(-5px); box-shadow: var(--card-hover-shadow);
+}
+.cert-award-item img {
+    max-width: 100%; height: 150px; object-fit: contain;
+    border-radius: 8px; margin-bottom: 10px;
+}
+"""
+
+# Layout for the exported static site (export_site.py), which has no Streamlit DOM to style.
+SITE_CSS = """
+:root {
+    --bg-color: #ffffff; --text-color: #31333f; --header-color: #31333f;
+    --card-bg-color: #f0f2f6; --muted-color: #6b6f7b;
+}
+@media (prefers-color-scheme: dark) {
+    :root {
+        --bg-color: #0e1117; --text-color: #fafafa; --header-color: #fafafa;
+        --card-bg-color: #262730; --muted-color: #a3a8b8;
+        --card-shadow: 0 4px 6px rgba(0,0,0,0.4); --card-hover-shadow: 0 8px 12px rgba(0,0,0,0.5);
+    }
+}
+body {
+    margin: 0; background-color: var(--bg-color); color: var(--text-color);
+    font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif; line-height: 1.6;
+}
+.layout { display: grid; grid-template-columns: 2fr 1fr; gap: 2rem; max-width: 1400px; margin: 0 auto; padding: 2rem; }
+@media (max-width: 900px) { .layout { grid-template-columns: 1fr; } }
+nav { display: flex; flex-wrap: wrap; gap: 1rem; margin-bottom: 1rem; }
+nav a { color: var(--selected-tab-bg); text-decoration: none; }
+hr { border: none; border-top: 1px solid var(--card-bg-color); margin: 2rem 0; }
+.header { display: flex; gap: 2rem; align-items: center; flex-wrap: wrap; }
+.header h1 { margin: 0; font-size: 2.75rem; }
+.header .subtitle { margin: 0; font-size: 1.5rem; font-weight: 600; }
+details { padding: 1rem; border-radius: 0.5rem; background-color: var(--card-bg-color); box-shadow: var(--card-shadow); margin-bottom: 1rem; }
+details summary { cursor: pointer; font-weight: 700; }
+.cards { display: grid; grid-template-columns: 1fr 1fr; gap: 2rem; }
+.cert-award-item { margin-bottom: 1rem; }
+.chat { position: sticky; top: 0; height: 100vh; display: flex; flex-direction: column; padding: 1rem 0; box-sizing: border-box; }
+.chat-log { flex: 1; overflow-y: auto; display: flex; flex-direction: column; gap: 0.75rem; }
+.chat-message { padding: 0.75rem 1rem; border-radius: 0.75rem; white-space: pre-wrap; max-width: 90%; }
+.chat-message.assistant { background-color: var(--card-bg-color); align-self: flex-start; }
+.chat-message.user { background-color: var(--tag-bg); color: var(--tag-color); align-self: flex-end; }
+.chat form { display: flex; gap: 0.5rem; margin-top: 1rem; }
+.chat input { flex: 1; padding: 0.75rem; border-radius: 0.5rem; border: 1px solid var(--muted-color); background: var(--bg-color); color: var(--text-color); }
+.chat button { padding: 0.75rem 1.25rem; border: none; border-radius: 0.5rem; background: var(--tag-bg); color: var(--tag-color); cursor: pointer; }
+"""
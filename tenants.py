@@ -0,0 +1,283 @@
+"""Multi-tenant hosting: many portfolios from one process, each selected by name (?profile=<name>).
+
+A tenant is a directory under PORTFOLIO_TENANTS_DIR (default ./tenants) holding a
+profile.json with the same fields as profile_data.DEFAULT_PROFILE, and the images it
+references by paths relative to that directory:
+
+    tenants/jane-doe/profile.json
+    tenants/jane-doe/media/photo.jpg
+
+Each tenant gets its own knowledge base, retrieval index, media manifest (see
+media_manifest.py), media variants and answer cache, loaded on first request and
+reloaded when its profile.json changes. The
+registry keeps at most `max_tenants` of them, within `max_bytes` of estimated
+memory, dropping the least recently requested first; the default profile
+(profile_data.py) is always resident.
+
+    python tenants.py                 # lists the tenants and their estimated footprint
+    python tenants.py --init jane-doe # starts a tenant from a copy of the default profile
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+
+import answer_cache
+import assets
+import retrieval
+import media_manifest
+from profile_data import DEFAULT_PROFILE, IMAGE_LISTS, media_variants
+
+TENANTS_DIR = os.environ.get("PORTFOLIO_TENANTS_DIR", "tenants")
+DEFAULT_TENANT = "default"
+SAFE_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+REQUIRED_FIELDS = media_manifest.REQUIRED_FIELDS
+
+# Measured with tracemalloc: a loaded tenant holds ~7.5x the size of its profile and
+# knowledge-base text (parsed JSON, chunks, index term counts), before its page fragments.
+FOOTPRINT_FACTOR = 8
+
+logger = logging.getLogger("portfolio")
+
+
+# --- KNOWLEDGE BASE ---
+def knowledge_base(profile):
+    """The whole profile as one text; answers cached against it are invalidated when it changes."""
+    p = profile
+    kb_parts=[f"Name: {p['name']}\nRole: {p['role']}\n\n## Professional Summary\n{p['professional_summary']}\n", "## Technical Skills\n" + "\n".join([f"- {cat.split(' ')[-1]}: {', '.join(skills)}" for cat, skills in p["technical_skills"].items()]),"\n## Professional Experience\n" + "\n".join([f"- **{title}**\n" + "\n".join([f"  - {point.split('<')[0]}" for point in points]) for title, points in p["professional_experience"].items()]),"\n## Projects\n" + "\n".join([f"- **{title}**: {details['description'].split('<')[0]} (Tech: {', '.join(details['tech'])})" for title, details in p["projects"].items()]),f"\n## Education\n- {p['education']['Degree']} from {p['education']['Institution']} ({p['education']['Graduation Year']}, CGPA: {p['education']['CGPA']})\n","## Certifications\n" + "\n".join([f"- **{cert['title']}**: {cert['description']}" for cert in p["certifications_data"]]),"\n## Awards\n" + "\n".join([f"- **{award['title']}**: {award['description']}" for award in p["awards_data"]]),"\n## Soft Skills\n- " + ", ".join(p["soft_skills"])]
+    return "\n".join(kb_parts)
+
+
+def knowledge_chunks(profile):
+    """Splits the knowledge base into self-contained, section-level chunks for retrieval."""
+    p = profile
+    return ([f"## Professional Summary\n{p['professional_summary'].strip()}"]
+            + [f"## Technical Skills: {cat.split(' ', 1)[-1]}\n- {', '.join(skills)}" for cat, skills in p["technical_skills"].items()]
+            + [f"## Professional Experience: {title}\n" + "\n".join([f"- {point.split('<')[0]}" for point in points]) for title, points in p["professional_experience"].items()]
+            + [f"## Projects: {title}\n{details['description'].split('<')[0]} (Tech: {', '.join(details['tech'])})" for title, details in p["projects"].items()]
+            + [f"## Education\n- {p['education']['Degree']} from {p['education']['Institution']} ({p['education']['Graduation Year']}, CGPA: {p['education']['CGPA']})"]
+            + [f"## Certifications: {cert['title']}\n{cert['description']}" for cert in p["certifications_data"]]
+            + [f"## Awards: {award['title']}\n{award['description']}" for award in p["awards_data"]]
+            + [f"## Soft Skills\n- {', '.join(p['soft_skills'])}"])
+
+
+# --- TENANTS ---
+class Tenant:
+    """One hosted profile and everything derived from it."""
+
+    def __init__(self, name, profile, answers, mtime=None):
+        self.name = name
+        self.profile = profile
+        self.answers = answers
+        self.mtime = mtime
+        self.bot_name = f"{profile['name'].split()[0]} Bot"
+        self.knowledge_base = knowledge_base(profile)
+        self.knowledge_header = f"Name: {profile['name']}\nRole: {profile['role']}"
+        self.index = retrieval.LexicalIndex(knowledge_chunks(profile))
+        self.media_variants = media_variants(profile)
+        # Checked once per load; the page asks it which images exist rather than stat-ing them.
+        self.manifest = media_manifest.build(profile)
+        for level, message in self.manifest.problems:
+            logger.log(logging.WARNING if level == "error" else logging.INFO, "profile %r: %s", name, message)
+        self.nbytes = FOOTPRINT_FACTOR * (len(json.dumps(profile, default=str)) + len(self.knowledge_base))
+        self._lock = threading.Lock()
+        self._asset_variants = {}
+        self._media_source = {}
+        self._static_urls = {}
+
+    def size(self):
+        """Estimated bytes held, including the answers cached so far."""
+        return self.nbytes + self.answers.size()
+
+    def asset_variants(self, formats=assets.FORMATS):
+        """The resized copies of the tenant's images, built (or loaded from the on-disk cache) on first use."""
+        with self._lock:
+            if formats not in self._asset_variants:
+                self._asset_variants[formats] = assets.build_assets([entry for entry in self.media_variants if entry[0] in self.manifest],
+                                                                    formats=formats)
+            return self._asset_variants[formats]
+
+    def media_source(self, formats=assets.FORMATS):
+        """The variant files as plain, comparable data, for keying the page fragments that show them."""
+        variants = self.asset_variants(formats)
+        with self._lock:
+            if formats not in self._media_source:
+                self._media_source[formats] = sorted((path, variant, sorted(files.items())) for (path, variant), files in variants.items())
+            return self._media_source[formats]
+
+    def static_media_urls(self, base_url):
+        """Publishes the image variants to the static folder and returns their fingerprinted URLs."""
+        variants = self.asset_variants()
+        with self._lock:
+            if base_url not in self._static_urls:
+                self._static_urls[base_url] = assets.publish_static(variants, base_url=base_url)
+            return self._static_urls[base_url]
+
+
+def profile_path(name, tenants_dir=TENANTS_DIR):
+    return os.path.join(tenants_dir, name, "profile.json")
+
+
+def load_profile(path):
+    """Reads a tenant's profile.json, filling optional sections and resolving image paths against its directory."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    # Blank counts as missing: the bot and greeting are named after the first word of `name`.
+    if missing := [field for field in REQUIRED_FIELDS if not str(data.get(field) or "").strip()]:
+        raise ValueError(f"{path}: missing {', '.join(missing)}")
+    root = os.path.realpath(os.path.dirname(path))
+
+    def resolve(relative):
+        # Images must stay inside the tenant's directory; anything else is dropped.
+        full = os.path.realpath(os.path.join(root, relative or ""))
+        return full if relative and os.path.commonpath([root, full]) == root else ""
+
+    profile = {"tagline": "", "technical_skills": {}, "professional_experience": {}, "projects": {}, "soft_skills": [],
+               "education": {"Degree": "", "Institution": "", "Graduation Year": "", "CGPA": ""}, **data}
+    profile.setdefault("chat_greeting", f"Hi there! I am {profile['name'].split()[0]}. How can I help you?")
+    profile["profile_photo_path"] = resolve(data.get("profile_photo_path"))
+    profile["social_links"] = [(label, resolve(icon), url) for label, icon, url in data.get("social_links", [])]
+    for key in IMAGE_LISTS:
+        profile[key] = [{**item, "image_path": resolve(item.get("image_path")), "description": item.get("description", "")}
+                        for item in data.get(key, [])]
+    return profile
+
+
+class TenantRegistry:
+    """Tenants loaded on demand, least recently requested first to go past `max_tenants` or `max_bytes`.
+
+    `on_evict(tenant)` is called for each tenant dropped (or replaced by a reload), so
+    callers can release what they cached for it.
+    """
+
+    def __init__(self, default, tenants_dir=TENANTS_DIR, max_tenants=200, max_bytes=128 * 2**20,
+                 answer_entries=128, answer_ttl=24 * 3600, on_evict=None):
+        self.default = default
+        self.tenants_dir = tenants_dir
+        self.max_tenants = max_tenants
+        self.max_bytes = max_bytes
+        self.answer_entries = answer_entries
+        self.answer_ttl = answer_ttl
+        self.on_evict = on_evict
+        self._lock = threading.Lock()
+        self._tenants = OrderedDict()  # name -> Tenant, least recently requested first
+        self._loading = {}  # name -> lock held while that tenant loads, so other tenants aren't kept waiting
+        self._broken = {}  # name -> mtime of a profile.json that failed to load
+        self.loads = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def tenants(self):
+        """The default tenant and every resident one."""
+        with self._lock:
+            return [self.default, *self._tenants.values()]
+
+    def get(self, name=None):
+        """The tenant called `name` (the default for None or "default"); None if there is no such profile.
+
+        A profile.json that can't be loaded counts as missing (and is logged) until it changes.
+        """
+        if not name or name == DEFAULT_TENANT:
+            return self.default
+        if not SAFE_NAME.match(name):
+            return None
+        path = profile_path(name, self.tenants_dir)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        with self._lock:
+            if (tenant := self._current(name, mtime)) or self._broken.get(name) == mtime:
+                return tenant
+            loading = self._loading.setdefault(name, threading.Lock())
+        # Reading the profile and checking its images happens outside the registry lock.
+        with loading:
+            with self._lock:
+                if (tenant := self._current(name, mtime)) or self._broken.get(name) == mtime:
+                    return tenant
+            try:
+                tenant = Tenant(name, load_profile(path), answer_cache.AnswerCache(self.answer_entries, self.answer_ttl), mtime)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("profile %r could not be loaded: %r", name, e)
+                with self._lock:
+                    self._broken[name] = mtime
+                return None
+            with self._lock:
+                self._broken.pop(name, None)
+                if name in self._tenants:
+                    self._drop(name)
+                self._tenants[name] = tenant
+                self.loads += 1
+                self._sweep()
+            return tenant
+
+    def _current(self, name, mtime):
+        """The resident tenant if it is up to date with its profile.json, marked most recently requested."""
+        tenant = self._tenants.get(name)
+        if tenant is not None and tenant.mtime == mtime:
+            self._tenants.move_to_end(name)
+            return tenant
+        return None
+
+    def _sweep(self):
+        # Sizes are recounted only when a tenant is loaded; between loads each one's answer cache is capped anyway.
+        total = sum(tenant.size() for tenant in self._tenants.values())
+        while len(self._tenants) > 1 and (len(self._tenants) > self.max_tenants or total > self.max_bytes):
+            total -= self._drop(next(iter(self._tenants))).size()
+            self.evicted += 1
+
+    def _drop(self, name):
+        tenant = self._tenants.pop(name)
+        if self.on_evict:
+            self.on_evict(tenant)
+        return tenant
+
+
+def init_tenant(name, tenants_dir=TENANTS_DIR):
+    """Writes tenants/<name>/ from a copy of the default profile and its images, as a starting point."""
+    if not SAFE_NAME.match(name):
+        raise SystemExit(f"{name!r}: use lowercase letters, digits, '-' and '_'")
+    root = os.path.join(tenants_dir, name)
+    if os.path.exists(root):
+        raise SystemExit(f"{root} already exists")
+
+    def copy(path):
+        if not path or not os.path.exists(path):
+            return ""
+        relative = os.path.join("media", os.path.relpath(path, "media"))
+        os.makedirs(os.path.dirname(os.path.join(root, relative)), exist_ok=True)
+        shutil.copyfile(path, os.path.join(root, relative))
+        return relative
+
+    profile = {**DEFAULT_PROFILE, "profile_photo_path": copy(DEFAULT_PROFILE["profile_photo_path"]),
+               "social_links": [(label, copy(icon), url) for label, icon, url in DEFAULT_PROFILE["social_links"]]}
+    for key in IMAGE_LISTS:
+        profile[key] = [{**item, "image_path": copy(item["image_path"])} for item in DEFAULT_PROFILE[key]]
+    with open(profile_path(name, tenants_dir), "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    return root
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=TENANTS_DIR, help="tenants directory")
+    parser.add_argument("--init", metavar="NAME", help="create a tenant from a copy of the default profile")
+    args = parser.parse_args()
+
+    if args.init:
+        print(f"Created {init_tenant(args.init, args.dir)}; edit its profile.json, then open ?profile={args.init}")
+    else:
+        for name in sorted(os.listdir(args.dir)) if os.path.isdir(args.dir) else []:
+            try:
+                tenant = Tenant(name, load_profile(profile_path(name, args.dir)), answer_cache.AnswerCache())
+                manifest = tenant.manifest
+                print(f"{name:24} {tenant.nbytes / 1024:7.1f} KB  {len(tenant.index.chunks):3} chunks  "
+                      f"{len(manifest.errors)} errors, {len(manifest.warnings)} warnings (python media_manifest.py --profile {name})")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"{name:24} error: {e}")
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from answer_cache import AnswerCache, make_key, normalise_question
+
+
+class KeyTest(unittest.TestCase):
+    def test_trivially_different_phrasings_share_a_key(self):
+        self.assertEqual(normalise_question("  What are your SKILLS?? "), "what are your skills")
+        self.assertEqual(make_key("What are your skills?", "kb"), make_key("what are your skills", "kb"))
+
+    def test_editing_the_knowledge_base_changes_the_key(self):
+        self.assertNotEqual(make_key("skills", "kb v1"), make_key("skills", "kb v2"))
+
+
+class AnswerCacheTest(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), ("A", None, "C"))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_entries_expire_after_the_ttl(self):
+        cache = AnswerCache(ttl=60)
+        with mock.patch("answer_cache.time.time", return_value=1000.0):
+            cache.put("a", "A")
+        with mock.patch("answer_cache.time.time", return_value=1059.0):
+            self.assertEqual(cache.get("a"), "A")
+        with mock.patch("answer_cache.time.time", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size(), 0)
+
+    def open(self, **options):
+        cache = AnswerCache(**options)
+        self.addCleanup(cache.close)
+        return cache
+
+    def db_path(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return os.path.join(tmp.name, "answers.db")
+
+    def test_sqlite_entries_survive_a_restart(self):
+        path = self.db_path()
+        self.open(path=path).put("a", "A")
+        self.assertEqual(self.open(path=path).get("a"), "A")
+
+    def test_sqlite_drops_expired_and_surplus_rows(self):
+        path = self.db_path()
+        with mock.patch("answer_cache.time.time", return_value=1000.0):
+            self.open(path=path).put("old", "stale")
+        cache = self.open(max_entries=2, ttl=60, path=path)
+        self.assertIsNone(cache.get("old"))
+        for key in "abc":
+            cache.put(key, key.upper())
+        self.assertIsNone(self.open(path=path).get("a"))
+        self.assertEqual(self.open(path=path).get("c"), "C")
+
+    def test_closed_cache_keeps_its_memory_entries(self):
+        cache = self.open(path=self.db_path())
+        cache.put("a", "A")
+        cache.close()
+        cache.close()
+        self.assertEqual(cache.get("a"), "A")
+
+
+if __name__ == "__main__":
+    unittest.main()
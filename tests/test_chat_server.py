@@ -0,0 +1,54 @@
+import http.client
+import json
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+import chat_server
+
+
+class ChatServerRequestTest(unittest.TestCase):
+    """Requests the endpoint must turn away before reading the body or calling the chatbot."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), chat_server.ChatHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        patcher = mock.patch("chat_server.chatbot.get_tenant", side_effect=AssertionError("reached the chatbot"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body=b"", headers=None):
+        connection = http.client.HTTPConnection(*self.server.server_address, timeout=2)
+        self.addCleanup(connection.close)
+        connection.putrequest("POST", "/api/chat")
+        for name, value in (headers or {"Content-Length": str(len(body))}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+
+    def test_a_negative_content_length_is_rejected_without_reading(self):
+        self.assertEqual(self.post(headers={"Content-Length": "-1"})[0], 400)
+
+    def test_a_missing_content_length_is_rejected(self):
+        self.assertEqual(self.post(headers={})[0], 400)
+
+    def test_an_oversized_body_is_rejected_before_reading_it(self):
+        self.assertEqual(self.post(headers={"Content-Length": str(chat_server.MAX_BODY_BYTES + 1)})[0], 413)
+
+    def test_a_profile_that_is_not_a_string_is_rejected(self):
+        body = json.dumps({"session": "s1", "message": "What is your CGPA?", "profile": 5}).encode()
+        self.assertEqual(self.post(body), (400, "'profile' must be a string"))
+
+
+if __name__ == "__main__":
+    unittest.main()
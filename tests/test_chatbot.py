@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+import unittest
+from unittest import mock
+
+import chatbot
+from memory import ConversationMemory
+from scheduler import RequestScheduler
+
+# Tier failures are logged as warnings; keep them out of the test output.
+logging.getLogger("portfolio").addHandler(logging.NullHandler())
+
+UNAVAILABLE = "The chatbot is currently unavailable. Please check the API key configuration."
+
+
+class ChatModelState(unittest.TestCase):
+    """Runs each test against fresh, lazily built chat models, with the backends given by `backends`."""
+
+    backends = {"CHAT_BACKEND": "fake", "CHAT_FALLBACK_BACKEND": "none"}
+
+    def setUp(self):
+        for name, value in {**self.backends, "_chat_model": None, "CHAT_SETUP_ERROR": None,
+                            "_fallback_model": None, "_fallback_failed": False}.items():
+            patcher = mock.patch.object(chatbot, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # A scheduler per test, so calls made by one test don't count against the next one's rate limit.
+        patcher = mock.patch("chatbot.get_scheduler", return_value=RequestScheduler(requests_per_minute=1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class NoApiKeyTest(ChatModelState):
+    backends = {"CHAT_BACKEND": "gemini", "CHAT_FALLBACK_BACKEND": "gemini"}
+
+    def setUp(self):
+        super().setUp()
+        for patcher in (mock.patch("chatbot.get_api_key", return_value=None),
+                        mock.patch("chatbot.model_backends.create_backend", side_effect=AssertionError("built a backend without a key"))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_models_are_not_built(self):
+        self.assertFalse(chatbot.chat_configured())
+        self.assertIsNone(chatbot.get_chat_model())
+        self.assertIsNone(chatbot.get_fallback_model())
+
+    def test_question_gets_the_unavailable_message_at_once(self):
+        started = time.monotonic()
+        reply = chatbot.get_chatbot_response("What was the hardest part of building the crawler?", ConversationMemory())
+        self.assertEqual(reply, UNAVAILABLE)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_profile_facts_are_answered_without_a_key(self):
+        reply = chatbot.get_chatbot_response("What is your CGPA?", ConversationMemory())
+        self.assertIn("CGPA", reply)
+        self.assertNotEqual(reply, UNAVAILABLE)
+
+    def test_follow_ups_are_not_routed(self):
+        memory = ConversationMemory()
+        memory.add_turn("Tell me about the chatbot project.", "It answers customer questions with RAG.")
+        self.assertEqual(chatbot.get_chatbot_response("What is your CGPA?", memory), UNAVAILABLE)
+
+
+class FallbackWithoutKeyTest(ChatModelState):
+    backends = {"CHAT_BACKEND": "gemini", "CHAT_FALLBACK_BACKEND": "fake:latency=0,chunk_delay=0,reply_words=5"}
+
+    def test_a_backend_that_needs_no_key_still_answers(self):
+        with mock.patch("chatbot.get_api_key", return_value=None):
+            self.assertIsNone(chatbot.get_chat_model())
+            reply = chatbot.get_chatbot_response("What was the hardest part of building the scraper?", ConversationMemory())
+        self.assertIn("Simulated answer to: What was the hardest part of building the scraper?", reply)
+
+
+class Scripted:
+    """A backend that waits `delay` seconds, then streams `chunks` (or raises `error`)."""
+
+    def __init__(self, chunks=(), delay=0.0, error=None):
+        self.chunks, self.delay, self.error = list(chunks), delay, error
+        self.calls = 0
+
+    def stream(self, history, message, usage, abort=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        yield from self.chunks
+
+
+class TiersTest(ChatModelState):
+    """Deadline, fallback and cancellation, with scripted backends and short tier timings."""
+
+    def use(self, primary, fallback=None, hedge_after=0.1, fallback_after=0.2, deadline=0.5):
+        for patcher in (mock.patch("chatbot.get_chat_model", return_value=primary),
+                        mock.patch("chatbot.get_fallback_model", return_value=fallback),
+                        mock.patch.multiple(chatbot, CHAT_HEDGE_AFTER=hedge_after, CHAT_FALLBACK_AFTER=fallback_after, CHAT_DEADLINE=deadline)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def ask(self, question, **options):
+        started = time.monotonic()
+        reply = "".join(chatbot.stream_chatbot_response(question, ConversationMemory(), **options))
+        return reply, time.monotonic() - started
+
+    def test_first_chunk_wins(self):
+        self.use(Scripted(["from ", "primary"]), Scripted(["from fallback"]))
+        self.assertEqual(self.ask("Describe the crawler rewrite in one line")[0], "from primary")
+
+    def test_slow_model_falls_back(self):
+        self.use(Scripted(["late"], delay=2), Scripted(["from fallback"]), deadline=5)
+        reply, seconds = self.ask("Describe the crawler rewrite in two lines")
+        self.assertEqual(reply, "from fallback")
+        self.assertLess(seconds, 1.5)
+
+    def test_deadline_gives_the_canned_answer(self):
+        self.use(Scripted(["late"], delay=2), None, deadline=0.3)
+        reply, seconds = self.ask("Describe the crawler rewrite in three lines")
+        self.assertEqual(reply, chatbot.canned_answer("Describe the crawler rewrite in three lines", chatbot.get_tenant()))
+        self.assertLess(seconds, 1.5)
+
+    def test_empty_reply_moves_on_to_the_next_tier(self):
+        primary = Scripted([])
+        self.use(primary, Scripted(["from fallback"]), hedge_after=5, fallback_after=10, deadline=15)
+        reply, seconds = self.ask("Describe the crawler rewrite in four lines")
+        self.assertEqual(reply, "from fallback")
+        self.assertEqual(primary.calls, 2)  # the primary call, then the hedge
+        self.assertLess(seconds, 1.0)
+
+    def test_failed_tiers_move_on_at_once(self):
+        self.use(Scripted(error=ValueError("bad request")), Scripted(["from fallback"]), hedge_after=5, fallback_after=10, deadline=15)
+        reply, seconds = self.ask("Describe the crawler rewrite in five lines")
+        self.assertEqual(reply, "from fallback")
+        self.assertLess(seconds, 1.0)
+
+    def test_a_new_message_cancels_the_previous_one(self):
+        self.use(Scripted(["answer"], delay=0.5), None, deadline=5)
+        first = []
+        thread = threading.Thread(target=lambda: first.append(self.ask("Describe the crawler rewrite in six lines", conversation_id="c1")))
+        thread.start()
+        time.sleep(0.1)
+        second, _ = self.ask("Describe the crawler rewrite in seven lines", conversation_id="c1")
+        thread.join(5)
+        self.assertEqual(first[0][0], "")  # nothing yielded, so nothing is recorded
+        self.assertEqual(second, "answer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+
+from conversation_store import ConversationStore
+from memory import ConversationMemory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def with_greeting():
+    return ConversationMemory(greeting="Hi!")
+
+
+class ConversationStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.spill_dir = tmp.name
+
+    def store(self, **options):
+        return ConversationStore(clock=self.clock, sweep_interval=0, **options)
+
+    def test_rejects_unsafe_ids(self):
+        with self.assertRaises(ValueError):
+            self.store().get("../etc/passwd")
+
+    def test_tracks_the_bytes_it_holds(self):
+        store = self.store()
+        store.get("a")
+        store.add_turn("a", "question", "answer")
+        self.assertEqual(store.total_bytes, store.get("a").size())
+
+    def test_least_recently_active_is_evicted_over_budget(self):
+        store = self.store(max_bytes=2000)
+        for conversation_id in "abc":
+            store.add_turn(conversation_id, "question", "x" * 600)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.evicted, 1)
+        self.assertLessEqual(store.total_bytes, 2000)
+        self.assertEqual(store.get("a").messages, [])  # dropped, so it starts over
+
+    def test_idle_conversations_spill_and_restore(self):
+        store = self.store(idle_seconds=60, spill_dir=self.spill_dir)
+        store.get("a", factory=with_greeting)
+        store.add_turn("a", "question", "answer")
+        self.clock.now = 61
+        store.get("b")
+        self.assertEqual((len(store), store.spilled), (1, 1))
+        self.assertTrue(os.path.exists(os.path.join(self.spill_dir, "a.json")))
+
+        memory = store.get("a")
+        self.assertEqual([m.content for m in memory.messages], ["Hi!", "question", "answer"])
+        self.assertEqual(store.restored, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.spill_dir, "a.json")))
+
+    def test_old_spill_files_expire(self):
+        store = self.store(spill_dir=self.spill_dir, spill_ttl=3600)
+        stale = os.path.join(self.spill_dir, "stale.json")
+        with open(stale, "w") as f:
+            f.write("{}")
+        os.utime(stale, (time.time() - 7200,) * 2)
+        store.get("a")
+        self.assertFalse(os.path.exists(stale))
+
+    def test_turn_after_eviction_starts_from_the_factory(self):
+        store = self.store(max_bytes=1500)
+        store.get("a", factory=with_greeting)
+        store.add_turn("b", "question", "x" * 1500)  # pushes "a" out mid-turn
+        memory = store.add_turn("a", "question", "answer", factory=with_greeting)
+        self.assertEqual([m.content for m in memory.messages], ["Hi!", "question", "answer"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import gemini_standin
+from gemini_client import GeminiAPIError, GeminiClient
+from scheduler import Abort
+
+
+class GeminiClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.state = gemini_standin.serve(0, latency=0, chunk_delay=0, words=10)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.state.mode = "up"
+        self.state.chunk_delay = 0
+
+    def client(self, **options):
+        client = GeminiClient("test-key", base_url=self.base_url, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_missing_api_key_fails_fast(self):
+        for key in (None, ""):
+            with self.assertRaises(ValueError):
+                GeminiClient(key, base_url=self.base_url)
+
+    def test_streams_the_reply_and_usage(self):
+        usage = {}
+        reply = "".join(self.client(probe_interval=0).stream([], "User Question: hello?", usage))
+        self.assertIn("Stand-in answer to: hello?", reply)
+        self.assertEqual(set(usage), {"prompt", "response"})
+
+    def test_non_ascii_text_survives_the_event_stream(self):
+        reply = "".join(self.client(probe_interval=0).stream([], "User Question: café – ✓ 🚀?", {}))
+        self.assertIn("café – ✓ 🚀?", reply)
+
+    def test_abort_ends_a_stream_waiting_for_its_next_chunk(self):
+        client, abort = self.client(probe_interval=0), Abort()
+        self.state.chunk_delay = 0.5
+        chunks = client.stream([], "User Question: hello?", {}, abort=abort)
+        next(chunks)
+        threading.Timer(0.05, abort).start()
+        started = time.monotonic()
+        self.assertEqual(list(chunks), [])
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(client.consecutive_failures, 0)  # an abort isn't an upstream failure
+
+    def test_close_stops_the_health_probe(self):
+        client = self.client(probe_interval=0.01)
+        client.start()
+        probe = client._probe_thread
+        self.assertTrue(probe.is_alive())
+        client.close()
+        self.assertFalse(probe.is_alive())
+        self.assertFalse(any(thread.name == "gemini-health-probe" and thread is probe for thread in threading.enumerate()))
+
+    def test_degraded_without_a_probe_lapses_after_degraded_for(self):
+        client = self.client(probe_interval=0, degraded_after=2, degraded_for=30)
+        self.state.mode = "down"
+        for _ in range(2):
+            with self.assertRaises(GeminiAPIError):
+                list(client.stream([], "User Question: hi", {}))
+        self.assertTrue(client.degraded)
+        with mock.patch("gemini_client.time.monotonic", return_value=client.last_failure + 31):
+            self.assertFalse(client.degraded)
+        self.state.mode = "up"
+        list(client.stream([], "User Question: hi", {}))
+        self.assertFalse(client.degraded)
+
+    def test_degraded_with_a_probe_until_it_succeeds(self):
+        client = self.client(probe_interval=3600, degraded_after=1, degraded_for=0)
+        client.start()
+        self.state.mode = "down"
+        self.assertFalse(client.probe()[0])
+        self.assertTrue(client.degraded)
+        self.state.mode = "up"
+        self.assertTrue(client.probe()[0])
+        self.assertFalse(client.degraded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import intent_router
+from profile_data import DEFAULT_PROFILE
+
+
+class RouteTest(unittest.TestCase):
+    def route(self, question):
+        return intent_router.route(question, DEFAULT_PROFILE)
+
+    def test_profile_facts_are_answered_from_the_data(self):
+        for question, intent in [
+            ("What is your CGPA?", "cgpa"),
+            ("Where did you study?", "education"),
+            ("What certifications do you have?", "certifications"),
+            ("What are your soft skills?", "soft_skills"),
+            ("Where do you work?", "experience"),
+            ("What are your skills?", "technical_skills"),
+            ("Which programming languages do you know?", "technical_skills"),
+            ("What's your CGPA?", "cgpa"),
+            ("Can you tell me your degree please", "education"),
+        ]:
+            with self.subTest(question):
+                self.assertEqual(intent_router.classify(question), intent)
+                self.assertTrue(self.route(question))
+        self.assertIn(DEFAULT_PROFILE["education"]["CGPA"], self.route("What is your CGPA?"))
+
+    def test_a_skill_area_narrows_the_answer(self):
+        reply = self.route("What are your cloud skills?")
+        self.assertIn("Cloud & DevOps", reply)
+        self.assertNotIn("Programming", reply)
+        self.assertIn("ML & AI", self.route("What are your machine learning skills?"))
+        self.assertIn("Programming", self.route("Which programming languages do you know?"))
+
+    def test_a_skill_area_no_category_covers_goes_to_the_model(self):
+        self.assertIsNone(self.route("What are your leadership skills?"))
+        self.assertIsNone(self.route("What are your Kubernetes skills?"))
+
+    def test_questions_that_ask_more_than_a_lookup_go_to_the_model(self):
+        for question in [
+            "What percentage of customer inquiries did your chatbot resolve?",
+            "What languages do you speak?",
+            "What tools did you use for image classification?",
+            "Why did you choose Python for the pipelines?",
+            "What are your marks in 12th grade?",
+            "What are your skills as a leader?",
+            "What is your skill level in Python?",
+            "What are your skills in machine learning?",
+            "How many years of experience do you have?",
+            "What was your CGPA in the first semester?",
+        ]:
+            with self.subTest(question):
+                self.assertIsNone(self.route(question))
+
+    def test_questions_about_a_project_go_to_the_model(self):
+        self.assertIsNone(self.route("What tools did you use for the image classification project?"))
+        self.assertIsNone(self.route("What are your skills on the customer service chatbot?"))
+        self.assertTrue(intent_router.names_project("How did the Financial Reporting workflow go?", DEFAULT_PROFILE))
+
+
+if __name__ == "__main__":
+    unittest.main()
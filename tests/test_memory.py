@@ -0,0 +1,57 @@
+import unittest
+
+from memory import ConversationMemory, estimate_tokens, summarise_turn
+
+
+class ConversationMemoryTest(unittest.TestCase):
+    def test_greeting_is_shown_but_not_sent_as_history(self):
+        memory = ConversationMemory(greeting="Hi!")
+        self.assertEqual([m.content for m in memory.messages], ["Hi!"])
+        self.assertEqual(memory.history(), [])
+
+    def test_older_turns_fold_into_the_summary(self):
+        memory = ConversationMemory(keep_turns=2)
+        for i in range(4):
+            memory.add_turn(f"question {i}", f"Answer {i}. More detail.")
+        self.assertEqual(memory.turns, [("question 2", "Answer 2. More detail."), ("question 3", "Answer 3. More detail.")])
+        self.assertEqual(memory.summary_lines, [summarise_turn("question 0", "Answer 0. More detail."),
+                                                summarise_turn("question 1", "Answer 1. More detail.")])
+        self.assertEqual(len(memory.messages), 8)  # folded turns stay on display
+
+    def test_token_budget_bounds_the_verbatim_history(self):
+        memory = ConversationMemory(keep_turns=10, token_budget=150, summary_budget=40)
+        for i in range(10):
+            memory.add_turn(f"question {i}", "x" * 120)
+        self.assertLessEqual(memory.tokens(), 150)
+        self.assertEqual(memory.turns[-1][0], "question 9")
+        self.assertLess(len(memory.turns), 10)
+
+    def test_summary_keeps_the_newest_lines_within_its_budget(self):
+        memory = ConversationMemory(keep_turns=1, summary_budget=60)
+        for i in range(20):
+            memory.add_turn(f"question {i}", f"answer {i}")
+        self.assertLessEqual(estimate_tokens(memory.summary), 60)
+        self.assertIn("question 18", memory.summary_lines[-1])
+
+    def test_display_log_is_trimmed_past_max_messages(self):
+        memory = ConversationMemory(keep_turns=1, max_messages=10)
+        for i in range(10):
+            memory.add_turn(f"question {i}", f"answer {i}")
+        self.assertEqual(len(memory.messages), 10)
+        self.assertEqual(memory.trimmed, 10)
+        self.assertEqual(memory.messages[-2].content, "question 9")
+        self.assertEqual(memory.nbytes, sum(m.nbytes() for m in memory.messages))
+
+    def test_round_trips_through_a_dict(self):
+        memory = ConversationMemory(keep_turns=2, max_messages=6, greeting="Hi!")
+        for i in range(5):
+            memory.add_turn(f"question {i}", f"answer {i}")
+        restored = ConversationMemory.from_dict(memory.to_dict(), keep_turns=2, max_messages=6)
+        self.assertEqual([(m.role, m.content) for m in restored.messages], [(m.role, m.content) for m in memory.messages])
+        self.assertEqual(restored.history(), memory.history())
+        self.assertEqual((restored.summary, restored.trimmed, restored.size()), (memory.summary, memory.trimmed, memory.size()))
+        self.assertEqual(restored.last_question(), "question 4")
+
+
+if __name__ == "__main__":
+    unittest.main()
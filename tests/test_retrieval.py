@@ -0,0 +1,46 @@
+import unittest
+
+from retrieval import LexicalIndex, tokenize
+
+CHUNKS = [
+    "## Professional Summary\nAI engineer building generative AI systems.",
+    "## Technical Skills: Frameworks\n- LangChain, TensorFlow, PyTorch",
+    "## Projects: Real-time Image Classification Model\nCNN image classifier in TensorFlow. (Tech: TensorFlow, Keras, OpenCV)",
+    "## Education\n- Bachelor of Engineering, CGPA 8.48",
+]
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_drops_stopwords_and_folds_plurals(self):
+        self.assertEqual(tokenize("What are your skills in the Frameworks?"), ["skill", "framework"])
+
+    def test_keeps_double_s_words(self):
+        self.assertEqual(tokenize("business class"), ["business", "class"])
+
+
+class LexicalIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = LexicalIndex(CHUNKS)
+
+    def test_best_match_ranks_first(self):
+        scores = self.index.score("image classification project")
+        self.assertEqual(max(range(len(CHUNKS)), key=scores.__getitem__), 2)
+
+    def test_rarer_terms_weigh_more(self):
+        # "tensorflow" appears in two chunks, "keras" in one: the chunk with both outranks the other.
+        scores = self.index.score("tensorflow keras")
+        self.assertGreater(scores[2], scores[1])
+
+    def test_search_limits_to_k_and_keeps_document_order(self):
+        self.assertEqual(self.index.search("tensorflow", k=5), [CHUNKS[1], CHUNKS[2]])
+        self.assertEqual(len(self.index.search("tensorflow", k=1)), 1)
+
+    def test_no_matching_terms_returns_nothing(self):
+        self.assertEqual(self.index.search("tell me about yourself"), [])
+
+    def test_empty_index(self):
+        self.assertEqual(LexicalIndex([]).search("anything"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
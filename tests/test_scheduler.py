@@ -0,0 +1,196 @@
+import threading
+import time
+import unittest
+
+from scheduler import Abort, RequestScheduler
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_calls_past_the_per_minute_limit_wait_for_the_window(self):
+        clock = FakeClock()
+        scheduler = RequestScheduler(max_concurrency=10, requests_per_minute=2, clock=clock)
+        waiters = [scheduler.submit(f"q{i}", lambda i=i: iter([f"answer {i}"])) for i in range(3)]
+
+        wait_until(lambda: waiters[0].ready() and waiters[1].ready() and waiters[2].position() == 1)
+        self.assertEqual(scheduler.calls, 2)
+        self.assertFalse(waiters[2].ready())
+
+        clock.now = 60.0
+        with scheduler._cond:
+            scheduler._cond.notify_all()
+        self.assertEqual(list(waiters[2].chunks()), ["answer 2"])
+        self.assertEqual(scheduler.calls, 3)
+
+    def test_concurrency_limit_serves_the_queue_in_order(self):
+        running, release = threading.Event(), threading.Event()
+        scheduler = RequestScheduler(max_concurrency=1, requests_per_minute=100)
+
+        def blocking():
+            running.set()
+            release.wait(2)
+            yield "first"
+
+        first = scheduler.submit("a", blocking)
+        running.wait(2)
+        second = scheduler.submit("b", lambda: iter(["second"]))
+        wait_until(lambda: second.position() == 1)
+        release.set()
+        self.assertEqual(list(first.chunks()), ["first"])
+        self.assertEqual(list(second.chunks()), ["second"])
+
+
+class CoalescingTest(unittest.TestCase):
+    def test_identical_requests_in_flight_share_one_call(self):
+        release = threading.Event()
+        started = []
+        scheduler = RequestScheduler()
+
+        def call():
+            started.append(1)
+            release.wait(2)
+            yield "Hello"
+            yield " world"
+
+        first = scheduler.submit("same question", call)
+        second = scheduler.submit("same question", call)
+        release.set()
+        self.assertEqual("".join(first.chunks()), "Hello world")
+        self.assertEqual("".join(second.chunks()), "Hello world")
+        self.assertEqual(len(started), 1)
+        self.assertEqual((scheduler.calls, scheduler.coalesced), (1, 1))
+
+    def test_closing_the_only_waiter_cancels_a_queued_call(self):
+        release = threading.Event()
+        scheduler = RequestScheduler(max_concurrency=1)
+        running = threading.Event()
+        busy = scheduler.submit("busy", lambda: (running.set(), release.wait(2), iter(["done"]))[2])
+        running.wait(2)
+        queued = scheduler.submit("queued", lambda: iter(["never"]))
+        wait_until(lambda: queued.position() == 1)
+        queued.close()
+        release.set()
+        self.assertEqual(list(busy.chunks()), ["done"])
+        self.assertEqual(scheduler.cancelled, 1)
+        self.assertEqual(scheduler.calls, 1)
+
+    def test_a_cancelled_call_frees_its_slot_while_still_blocked(self):
+        running, release = threading.Event(), threading.Event()
+        scheduler = RequestScheduler(max_concurrency=1)
+
+        def stuck():  # an upstream that never answers, and ignores the abort
+            running.set()
+            release.wait(5)
+            yield "late"
+
+        stuck_waiter = scheduler.submit("stuck", stuck)
+        running.wait(2)
+        stuck_waiter.close()
+        started = time.monotonic()
+        self.assertEqual(list(scheduler.submit("next", lambda: iter(["next"])).chunks()), ["next"])
+        self.assertLess(time.monotonic() - started, 0.5)
+        release.set()
+        wait_until(lambda: stuck_waiter.flight.done)
+        self.assertEqual(scheduler._active, 0)
+
+    def test_cancelling_a_running_call_aborts_it(self):
+        running, stopped = threading.Event(), threading.Event()
+        abort = Abort()
+
+        def call():
+            abort.on_abort(stopped.set)
+            running.set()
+            stopped.wait(5)
+            return iter([])
+
+        waiter = RequestScheduler().submit("q", call, abort=abort)
+        running.wait(2)
+        waiter.close()
+        self.assertTrue(stopped.wait(0.5))
+        self.assertTrue(abort.aborted)
+
+    def test_an_abort_registered_too_late_runs_at_once(self):
+        abort, actions = Abort(), []
+        abort()
+        abort.on_abort(lambda: actions.append("closed"))
+        self.assertEqual(actions, ["closed"])
+
+
+class RetryTest(unittest.TestCase):
+    def make(self, **options):
+        delays = []
+        return RequestScheduler(base_delay=1.0, max_delay=20.0, sleep=delays.append, **options), delays
+
+    def test_rate_limit_and_server_errors_are_retried_with_backoff(self):
+        scheduler, delays = self.make()
+        failures = [ApiError(429), ApiError(503)]
+
+        def call():
+            if failures:
+                raise failures.pop(0)
+            return iter(["ok"])
+
+        self.assertEqual(list(scheduler.stream("q", call)), ["ok"])
+        self.assertEqual(scheduler.retries, 2)
+        # Jittered exponential backoff: attempt n sleeps between half and all of base * 2**n.
+        self.assertTrue(1.0 <= delays[0] <= 2.0, delays)
+        self.assertTrue(2.0 <= delays[1] <= 4.0, delays)
+
+    def test_gives_up_after_max_retries(self):
+        scheduler, delays = self.make(max_retries=2)
+
+        def call():
+            raise ApiError(500)
+
+        with self.assertRaises(ApiError):
+            list(scheduler.stream("q", call))
+        self.assertEqual(len(delays), 2)
+
+    def test_client_errors_are_not_retried(self):
+        scheduler, delays = self.make()
+
+        def call():
+            raise ApiError(400)
+
+        with self.assertRaises(ApiError):
+            list(scheduler.stream("q", call))
+        self.assertEqual(delays, [])
+
+    def test_a_call_that_already_streamed_is_not_repeated(self):
+        scheduler, delays = self.make()
+
+        def call():
+            yield "partial"
+            raise ApiError(503)
+
+        chunks = []
+        with self.assertRaises(ApiError):
+            for chunk in scheduler.stream("q", call):
+                chunks.append(chunk)
+        self.assertEqual(chunks, ["partial"])
+        self.assertEqual(delays, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import answer_cache
+import tenants
+from profile_data import DEFAULT_PROFILE
+
+# The test profiles have no images; keep the manifest's warnings about that out of the output.
+logging.getLogger("portfolio").addHandler(logging.NullHandler())
+
+
+def write_profile(tenants_dir, tenant, **fields):
+    os.makedirs(os.path.join(tenants_dir, tenant), exist_ok=True)
+    profile = {key: DEFAULT_PROFILE[key] for key in ("name", "role", "professional_summary", "projects", "education")}
+    with open(tenants.profile_path(tenant, tenants_dir), "w") as f:
+        json.dump({**profile, **fields}, f)
+
+
+class TenantRegistryTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        default = tenants.Tenant(tenants.DEFAULT_TENANT, DEFAULT_PROFILE, answer_cache.AnswerCache())
+        self.registry = tenants.TenantRegistry(default, tenants_dir=self.dir)
+
+    def test_default_and_unknown_names(self):
+        self.assertIs(self.registry.get(None), self.registry.default)
+        self.assertIsNone(self.registry.get("nobody"))
+        self.assertIsNone(self.registry.get("../etc"))
+
+    def test_loads_once_and_reloads_when_the_profile_changes(self):
+        write_profile(self.dir, "jane", name="Jane Doe")
+        first = self.registry.get("jane")
+        self.assertEqual(first.bot_name, "Jane Bot")
+        self.assertIs(self.registry.get("jane"), first)
+        write_profile(self.dir, "jane", name="Janet Doe")
+        os.utime(tenants.profile_path("jane", self.dir), (time.time() + 5,) * 2)
+        self.assertEqual(self.registry.get("jane").bot_name, "Janet Bot")
+        self.assertEqual(self.registry.loads, 2)
+
+    def test_malformed_profiles_count_as_missing(self):
+        os.makedirs(os.path.join(self.dir, "bad-json"))
+        with open(tenants.profile_path("bad-json", self.dir), "w") as f:
+            f.write("{not json")
+        write_profile(self.dir, "no-name", name="")
+        write_profile(self.dir, "blank-name", name="   ")
+        write_profile(self.dir, "bad-projects", projects={"X": {"tech": []}})
+        with self.assertLogs("portfolio", "WARNING"):
+            for name in ("bad-json", "no-name", "blank-name", "bad-projects"):
+                self.assertIsNone(self.registry.get(name), name)
+
+    def test_a_broken_profile_is_not_reloaded_until_it_changes(self):
+        write_profile(self.dir, "jane", name="")
+        with self.assertLogs("portfolio", "WARNING"):
+            self.registry.get("jane")
+        with mock.patch("tenants.load_profile") as load:
+            self.assertIsNone(self.registry.get("jane"))
+        load.assert_not_called()
+
+    def test_a_slow_load_does_not_hold_up_other_tenants(self):
+        write_profile(self.dir, "slow", name="Slow Doe")
+        write_profile(self.dir, "fast", name="Fast Doe")
+        release = threading.Event()
+        load_profile = tenants.load_profile
+
+        def slow_load(path):
+            if "slow" in path:
+                release.wait(5)
+            return load_profile(path)
+
+        with mock.patch("tenants.load_profile", side_effect=slow_load):
+            thread = threading.Thread(target=self.registry.get, args=("slow",))
+            thread.start()
+            time.sleep(0.05)
+            started = time.monotonic()
+            self.assertEqual(self.registry.get("fast").bot_name, "Fast Bot")
+            self.assertLess(time.monotonic() - started, 1.0)
+            release.set()
+            thread.join()
+        self.assertEqual(self.registry.get("slow").bot_name, "Slow Bot")
+
+    def test_least_recently_requested_tenant_is_evicted(self):
+        evicted = []
+        self.registry.max_tenants, self.registry.on_evict = 2, evicted.append
+        for name in ("a", "b", "c"):
+            write_profile(self.dir, name, name=name.upper())
+            self.registry.get(name)
+        self.assertEqual([tenant.name for tenant in evicted], ["a"])
+        self.assertEqual(len(self.registry), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()